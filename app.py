@@ -11,16 +11,22 @@ import json
 import shutil
 import tempfile
 import gradio as gr
+import uvicorn
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 # Import our modular components
-from config.settings import HF_SERVER_NAME, HF_SERVER_PORT
-from utils.file_utils import clean_filename, detect_file_source
+from config.settings import HF_SERVER_NAME, HF_SERVER_PORT, CHUNKED_TRANSCRIPTION_MIN_SECONDS
+from utils.file_utils import clean_filename, detect_file_source, load_json_file, read_text_file
 from services.download_service import download_file_from_source
-from services.audio_service import get_audio_duration, process_audio_file
+from services.audio_service import get_audio_duration, process_audio_file, split_audio_file
 from services.transcription_service import TranscriptionService
-from processors.transcript_processor import analyze_transcript_quality, count_unique_speakers
+from processors.transcript_processor import (
+    analyze_transcript_quality, count_unique_speakers, words_to_columns, is_elevenlabs_transcript,
+    intern_speaker_ids
+)
 from processors.output_generator import generate_txt_transcript, generate_srt_subtitles, save_transcript_files
-from services.file_service import handle_download_selection
+from services.file_service import handle_download_selection, register_output_dir, is_servable_path, stream_zip
 from ui.interface import create_interface, get_clear_function
 
 
@@ -51,6 +57,7 @@ def process_transcript_complete(episode_name, source_type, delivery_method, file
 
         # Create temp directory for this session
         temp_dir = tempfile.mkdtemp()
+        register_output_dir(temp_dir)
 
         # File paths
         base_filename = clean_episode_name
@@ -81,12 +88,11 @@ def process_transcript_complete(episode_name, source_type, delivery_method, file
                 shutil.copy2(file_input, json_path)
 
                 # Load and validate JSON
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    uploaded_json = json.load(f)
+                uploaded_json = load_json_file(json_path)
 
-                if 'text' in uploaded_json or 'words' in uploaded_json:
+                if is_elevenlabs_transcript(uploaded_json):
                     full_transcript_text = uploaded_json.get("text", "")
-                    words_data = uploaded_json.get("words", [])
+                    words_data = intern_speaker_ids(uploaded_json.get("words", []))
 
                     # Save to cache
                     with open(raw_json_cache_path, 'w', encoding='utf-8') as f:
@@ -104,12 +110,11 @@ def process_transcript_complete(episode_name, source_type, delivery_method, file
                 json_download_path = downloaded_source_path + ".json"
                 download_file_from_source(json_url, json_download_path, detected_source)
 
-                with open(json_download_path, 'r', encoding='utf-8') as f:
-                    downloaded_json = json.load(f)
+                downloaded_json = load_json_file(json_download_path)
 
-                if 'text' in downloaded_json or 'words' in downloaded_json:
+                if is_elevenlabs_transcript(downloaded_json):
                     full_transcript_text = downloaded_json.get("text", "")
-                    words_data = downloaded_json.get("words", [])
+                    words_data = intern_speaker_ids(downloaded_json.get("words", []))
 
                     # Save to cache
                     with open(raw_json_cache_path, 'w', encoding='utf-8') as f:
@@ -156,8 +161,10 @@ def process_transcript_complete(episode_name, source_type, delivery_method, file
             target_audio_path = process_audio_file(source_file_path, temp_dir, base_filename)
 
             # Clean up original downloaded source file
-            if os.path.exists(source_file_path):
+            try:
                 os.remove(source_file_path)
+            except FileNotFoundError:
+                pass
 
             audio_file_ready = True
 
@@ -167,11 +174,22 @@ def process_transcript_complete(episode_name, source_type, delivery_method, file
 
                 try:
                     transcription_service = TranscriptionService(api_key)
-                    transcription_response = transcription_service.transcribe_audio(
-                        target_audio_path,
-                        language_code=language,
-                        diarize=True
-                    )
+
+                    if (CHUNKED_TRANSCRIPTION_MIN_SECONDS is not None and audio_duration
+                            and audio_duration >= CHUNKED_TRANSCRIPTION_MIN_SECONDS):
+                        # Long recording - transcribe fixed-length chunks in parallel
+                        chunk_paths = split_audio_file(target_audio_path, temp_dir, base_filename)
+                        transcription_response = transcription_service.transcribe_audio_chunked(
+                            chunk_paths,
+                            language_code=language,
+                            diarize=True
+                        )
+                    else:
+                        transcription_response = transcription_service.transcribe_audio(
+                            target_audio_path,
+                            language_code=language,
+                            diarize=True
+                        )
 
                     full_transcript_text, words_data, response_dict = transcription_service.extract_transcription_data(transcription_response)
 
@@ -185,24 +203,24 @@ def process_transcript_complete(episode_name, source_type, delivery_method, file
                 except Exception as e:
                     return f"❌ Transcription error: {str(e)}", "", "", "", None, None, None, None
 
+        # Convert words to columns once; every later pass reads the same arrays
+        word_columns = words_to_columns(words_data or [])
+
         # Step 4: Analyze transcript quality
         progress(0.72, desc="Analyzing transcript quality...")
-        quality_warnings = analyze_transcript_quality(words_data, audio_duration)
+        quality_warnings = analyze_transcript_quality(word_columns, audio_duration)
 
         # Step 5: Generate outputs
         progress(0.75, desc="Generating transcript formats...")
 
         # Generate TXT transcript
-        txt_content = generate_txt_transcript(words_data, full_transcript_text)
+        txt_content = generate_txt_transcript(word_columns, full_transcript_text)
 
         # Generate SRT subtitles
-        srt_content = generate_srt_subtitles(words_data)
+        srt_content = generate_srt_subtitles(word_columns)
 
         # Load JSON for display
-        json_content = ""
-        if os.path.exists(raw_json_cache_path):
-            with open(raw_json_cache_path, 'r', encoding='utf-8') as f:
-                json_content = f.read()
+        json_content = read_text_file(raw_json_cache_path)
 
         # Step 6: Save files
         progress(0.95, desc="Saving files...")
@@ -215,7 +233,7 @@ def process_transcript_complete(episode_name, source_type, delivery_method, file
         progress(1.0, desc="Processing completed!")
 
         # Count speakers
-        unique_speakers_count = count_unique_speakers(words_data)
+        unique_speakers_count = count_unique_speakers(word_columns)
 
         # Generate audio filename for display
         audio_filename = os.path.basename(target_audio_path) if target_audio_path else ""
@@ -252,6 +270,28 @@ def process_transcript_complete(episode_name, source_type, delivery_method, file
         return f"❌ Error during processing: {str(e)}", "", "", "", None, None, None, None
 
 
+def create_app(interface):
+    """Mount the Gradio interface on a FastAPI app with a streaming ZIP endpoint"""
+    server = FastAPI()
+
+    # API-only: the UI's "Prepare Download" button still builds its ZIP through
+    # handle_download_selection, because gr.File needs a file on disk
+    @server.get("/download-zip")
+    def download_zip(path: list[str] = Query(...), episode_name: str = "transcript"):
+        if not all(is_servable_path(p) for p in path):
+            raise HTTPException(status_code=404, detail="File not found")
+
+        names = [os.path.basename(p) for p in path]
+        zip_filename = f"{clean_filename(episode_name)}_selected_files.zip"
+        return StreamingResponse(
+            stream_zip(path, names),
+            media_type="application/zip",
+            headers={"Content-Disposition": f'attachment; filename="{zip_filename}"'}
+        )
+
+    return gr.mount_gradio_app(server, interface, path="/", show_error=True)
+
+
 def main():
     """Main function to launch the application"""
     print("🔔 Starting Valuebell Transcriber (Modular Version)...")
@@ -267,17 +307,10 @@ def main():
         clear_function=clear_function
     )
 
-    # Launch the interface
-    interface.launch(
-        server_name=HF_SERVER_NAME,
-        server_port=HF_SERVER_PORT,
-        share=False,
-        show_error=True
-    )
-
-    print("\n" + "="*60)
-    print("✅ Valuebell Transcriber is now running!")
-    print("=" * 60)
+    # Launch the interface (Gradio UI plus the /download-zip endpoint);
+    # uvicorn logs the address once the server is accepting connections
+    server = create_app(interface)
+    uvicorn.run(server, host=HF_SERVER_NAME, port=HF_SERVER_PORT)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 """
 Configuration constants for Valuebell Transcriber
 """
+import os
 
 # Application metadata
 APP_NAME = "Valuebell Transcriber"
@@ -16,6 +17,25 @@ STANDARD_MP3_SAMPLE_RATE = 44100
 MAX_WAV_SIZE_GB = 1  # Convert to MP3 if larger than 1GB
 MAX_WAV_SIZE_BYTES = MAX_WAV_SIZE_GB * 1024 * 1024 * 1024
 
+# Download settings
+PROGRESS_UPDATE_INTERVAL_SECONDS = 0.1  # Minimum time between download progress prints
+
+# Download endpoint settings
+MAX_SERVED_OUTPUT_DIRS = 64  # Job output dirs /download-zip serves; past this the oldest stop being served (never deleted)
+
+# Transcription upload settings
+UPLOAD_BUFFER_SIZE = 1024 * 1024  # Read buffer for streaming audio uploads
+MAX_KEEPALIVE_CONNECTIONS = 8  # Pooled connections to the ElevenLabs API
+
+# Chunked transcription settings
+CHUNK_DURATION_SECONDS = 600  # Length of each audio chunk sent in parallel
+MAX_CONCURRENT_TRANSCRIPTIONS = 4  # Parallel requests, kept low for API rate limits
+CHUNKED_TRANSCRIPTION_MIN_SECONDS = None  # Set (e.g. 7200) to enable; speaker IDs are per chunk
+
+# Transcription cache settings
+TRANSCRIPTION_MODEL_ID = "scribe_v1_experimental"
+TRANSCRIPTION_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "valuebell-transcriber")
+
 # SRT subtitle settings
 MAX_CUE_DURATION_SECONDS = 7
 MAX_CUE_CHARACTERS = 120
@@ -35,6 +55,11 @@ ALL_SUPPORTED_EXTENSIONS = (
     SUPPORTED_VIDEO_EXTENSIONS +
     SUPPORTED_JSON_EXTENSIONS
 )
+# Set form for membership checks
+ALL_SUPPORTED_EXTENSION_SET = frozenset(ext.lower() for ext in ALL_SUPPORTED_EXTENSIONS)
+
+# Text outputs are deflated in download ZIPs; audio is stored as-is
+COMPRESSIBLE_ARCHIVE_EXTENSIONS = (".txt", ".srt", ".json")
 
 # Language options
 SUPPORTED_LANGUAGES = [
@@ -1,9 +1,9 @@
 """
 Output generation for different transcript formats (TXT, SRT, JSON)
 """
-from utils.file_utils import get_word_attr
-from utils.format_utils import format_txt_timestamp, format_srt_time
-from processors.transcript_processor import group_words_by_speaker
+import numpy as np
+from utils.format_utils import format_txt_timestamps, format_srt_times
+from processors.transcript_processor import group_words_by_speaker, words_to_columns
 from config.settings import (
     TRANSCRIPT_DISCLAIMER,
     MAX_CUE_DURATION_SECONDS,
@@ -17,10 +17,11 @@ def generate_txt_transcript(words_data, full_transcript_text=""):
 
     if words_data:
         speaker_segments = group_words_by_speaker(words_data)
+        timestamps = format_txt_timestamps([segment['start_time'] for segment in speaker_segments])
 
         # Build TXT content - keeping original speaker IDs
-        for segment in speaker_segments:
-            txt_content += f"[{format_txt_timestamp(segment['start_time'])}] {segment['speaker']}:\n"
+        for timestamp, segment in zip(timestamps, speaker_segments):
+            txt_content += f"[{timestamp}] {segment['speaker']}:\n"
             txt_content += f"{' '.join(segment['text_parts'])}\n\n"
     else:
         txt_content = TRANSCRIPT_DISCLAIMER + full_transcript_text
@@ -33,53 +34,52 @@ def generate_srt_subtitles(words_data):
     if not words_data:
         return ""
 
-    srt_cues = []
-    cue_number = 1
-    current_cue_words_info = []
-    current_cue_speaker = None
-    current_cue_start_time = None
+    columns = words_to_columns(words_data)
+    starts = columns.starts.tolist()
+    ends = columns.ends.tolist()
+    speakers = columns.speakers.tolist()
 
-    for word_obj in words_data:
-        word_text_val = get_word_attr(word_obj, 'text')
-        word_start_val = get_word_attr(word_obj, 'start')
-        word_end_val = get_word_attr(word_obj, 'end')
-        speaker_id_val = get_word_attr(word_obj, 'speaker_id', "speaker_unknown")
+    cues = []  # (first word index, last word index, speaker code, text)
+    current_cue_texts = []
+    current_cue_length = 0
+    current_cue_first = None
+    current_cue_last = None
 
-        if not (word_text_val and word_start_val is not None and word_end_val is not None):
+    for i, word_text_val in enumerate(columns.texts):
+        # NaN marks a missing timestamp
+        if not word_text_val or starts[i] != starts[i] or ends[i] != ends[i]:
             continue
 
-        finalize_current_cue = False
-
-        if not current_cue_words_info:
-            current_cue_speaker = speaker_id_val
-            current_cue_start_time = word_start_val
-        elif (speaker_id_val != current_cue_speaker or
-                (word_end_val - current_cue_start_time) > MAX_CUE_DURATION_SECONDS or
-                len(" ".join([w['text'] for w in current_cue_words_info] + [word_text_val])) > MAX_CUE_CHARACTERS):
-            finalize_current_cue = True
-
-        if finalize_current_cue and current_cue_words_info:
-            cue_text_str = " ".join([w['text'] for w in current_cue_words_info])
-            srt_cues.append(
-                f"{cue_number}\n"
-                f"{format_srt_time(current_cue_start_time)} --> {format_srt_time(current_cue_words_info[-1]['end_time'])}\n"
-                f"{current_cue_speaker}: {cue_text_str}\n"
-            )
-            cue_number += 1
-            current_cue_words_info = []
-            current_cue_speaker = speaker_id_val
-            current_cue_start_time = word_start_val
-
-        current_cue_words_info.append({'text': word_text_val, 'end_time': word_end_val})
+        if current_cue_texts and (
+                speakers[i] != speakers[current_cue_first] or
+                (ends[i] - starts[current_cue_first]) > MAX_CUE_DURATION_SECONDS or
+                current_cue_length + 1 + len(word_text_val) > MAX_CUE_CHARACTERS):
+            cues.append((current_cue_first, current_cue_last, speakers[current_cue_first], " ".join(current_cue_texts)))
+            current_cue_texts = []
+
+        if not current_cue_texts:
+            current_cue_first = i
+            current_cue_length = len(word_text_val)
+        else:
+            current_cue_length += 1 + len(word_text_val)
+        current_cue_texts.append(word_text_val)
+        current_cue_last = i
 
     # Handle final cue
-    if current_cue_words_info:
-        cue_text_str = " ".join([w['text'] for w in current_cue_words_info])
-        srt_cues.append(
-            f"{cue_number}\n"
-            f"{format_srt_time(current_cue_start_time)} --> {format_srt_time(current_cue_words_info[-1]['end_time'])}\n"
-            f"{current_cue_speaker}: {cue_text_str}\n"
-        )
+    if current_cue_texts:
+        cues.append((current_cue_first, current_cue_last, speakers[current_cue_first], " ".join(current_cue_texts)))
+
+    # Format every cue timestamp in one batch
+    start_times = format_srt_times(columns.starts[np.array([cue[0] for cue in cues], dtype=np.intp)])
+    end_times = format_srt_times(columns.ends[np.array([cue[1] for cue in cues], dtype=np.intp)])
+
+    srt_cues = [
+        f"{cue_number}\n"
+        f"{start_time} --> {end_time}\n"
+        f"{columns.speaker_names[speaker]}: {cue_text_str}\n"
+        for cue_number, (start_time, end_time, (_, _, speaker, cue_text_str))
+        in enumerate(zip(start_times, end_times, cues), start=1)
+    ]
 
     return "\n".join(srt_cues)
 
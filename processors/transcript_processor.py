@@ -1,8 +1,11 @@
 """
 Transcript processing and quality analysis
 """
+import sys
+from dataclasses import dataclass
+from itertools import groupby
 import numpy as np
-from utils.file_utils import get_word_attr
+from utils.file_utils import word_attr_values
 from utils.format_utils import format_txt_timestamp
 from config.settings import (
     OUTLIER_Z_SCORE_THRESHOLD,
@@ -11,6 +14,69 @@ from config.settings import (
 )
 
 
+# A transcript needs at least one of these top-level keys to be treated as ElevenLabs output
+TRANSCRIPT_KEYS = ('text', 'words')
+
+
+def is_elevenlabs_transcript(data):
+    """Check that parsed JSON looks like an ElevenLabs transcription response"""
+    return isinstance(data, dict) and not data.keys().isdisjoint(TRANSCRIPT_KEYS)
+
+
+def intern_speaker_ids(words_data):
+    """Intern speaker_id strings of loaded word dicts in place so repeated ids share one object"""
+    for word in words_data or ():
+        if isinstance(word, dict):
+            speaker_id = word.get('speaker_id')
+            if isinstance(speaker_id, str):
+                word['speaker_id'] = sys.intern(speaker_id)
+    return words_data
+
+
+def word_timestamp_array(words_data, attr_name):
+    """Collect one timestamp attribute of every word into a float64 array (NaN if missing)"""
+    values = word_attr_values(words_data, attr_name)
+    return np.fromiter(
+        (np.nan if value is None else value for value in values),
+        dtype=np.float64,
+        count=len(words_data)
+    )
+
+
+@dataclass
+class WordColumns:
+    """Transcript words stored as parallel columns instead of a list of word objects"""
+    texts: list
+    starts: np.ndarray
+    ends: np.ndarray
+    speakers: np.ndarray
+    speaker_names: list
+
+    def __len__(self):
+        return len(self.texts)
+
+
+def words_to_columns(words_data):
+    """Convert word dicts/objects into WordColumns; speakers become int32 codes into speaker_names"""
+    if isinstance(words_data, WordColumns):
+        return words_data
+
+    speaker_codes = {}
+    speakers = np.fromiter(
+        (speaker_codes.setdefault(speaker_id, len(speaker_codes))
+         for speaker_id in word_attr_values(words_data, 'speaker_id', "speaker_unknown")),
+        dtype=np.int32,
+        count=len(words_data)
+    )
+    return WordColumns(
+        texts=word_attr_values(words_data, 'text'),
+        starts=word_timestamp_array(words_data, 'start'),
+        ends=word_timestamp_array(words_data, 'end'),
+        speakers=speakers,
+        speaker_names=list(speaker_codes)
+    )
+
+
 def analyze_transcript_quality(words_data, audio_duration=None):
     """Analyze transcript for potential issues and return warnings"""
     warnings = []
@@ -18,31 +84,29 @@ def analyze_transcript_quality(words_data, audio_duration=None):
     if not words_data:
         return warnings
 
-    # Calculate durations for all tokens
-    token_durations = []
-    token_info = []
-
-    for i, word_obj in enumerate(words_data):
-        start_time = get_word_attr(word_obj, 'start')
-        end_time = get_word_attr(word_obj, 'end')
-        text = get_word_attr(word_obj, 'text', '')
-
-        if start_time is not None and end_time is not None:
-            duration = end_time - start_time
-            token_durations.append(duration)
-            token_info.append({
-                'index': i,
-                'text': text,
-                'start': start_time,
-                'end': end_time,
-                'duration': duration
-            })
-
-    if not token_durations:
+    columns = words_to_columns(words_data)
+    starts = columns.starts
+    ends = columns.ends
+
+    # Only tokens with both timestamps take part in the analysis
+    token_indices = np.flatnonzero(~(np.isnan(starts) | np.isnan(ends)))
+    if token_indices.size == 0:
         return warnings
 
+    durations_array = ends[token_indices] - starts[token_indices]
+
+    def token_at(position):
+        index = int(token_indices[position])
+        return {
+            'index': index,
+            'text': columns.texts[index] or '',
+            'start': float(starts[index]),
+            'end': float(ends[index]),
+            'duration': float(durations_array[position])
+        }
+
     # Check final token
-    final_token = token_info[-1]
+    final_token = token_at(-1)
     if final_token['duration'] > ABNORMAL_FINAL_TOKEN_DURATION:
         warnings.append(
             f"⚠️ Final token has abnormal duration: '{final_token['text']}' "
@@ -51,34 +115,25 @@ def analyze_transcript_quality(words_data, audio_duration=None):
         )
 
     # Calculate statistics
-    durations_array = np.array(token_durations)
-    mean_duration = np.mean(durations_array)
-    std_duration = np.std(durations_array)
+    mean_duration = durations_array.mean()
+    std_duration = durations_array.std()
 
     # Calculate z-scores (only if std > 0 to avoid division by zero)
     if std_duration > 0:
         z_scores = (durations_array - mean_duration) / std_duration
 
-        # Find outliers (z-score > threshold)
-        outliers = []
-
-        for i, z_score in enumerate(z_scores):
-            if z_score > OUTLIER_Z_SCORE_THRESHOLD:
-                token = token_info[i]
-                outliers.append(token)
-
-        # Report outliers (excluding the final token if already reported)
-        for outlier in outliers:
-            if outlier['index'] != len(token_info) - 1:  # Not the final token
-                warnings.append(
-                    f"⚠️ Potential error: Token '{outlier['text']}' at "
-                    f"{format_txt_timestamp(outlier['start'])} has unusual duration "
-                    f"of {outlier['duration']:.1f} seconds (z-score: {z_scores[outlier['index']]:.2f})"
-                )
+        # Report outliers (z-score > threshold), excluding the final token if already reported
+        for position in np.flatnonzero(z_scores[:-1] > OUTLIER_Z_SCORE_THRESHOLD):
+            outlier = token_at(position)
+            warnings.append(
+                f"⚠️ Potential error: Token '{outlier['text']}' at "
+                f"{format_txt_timestamp(outlier['start'])} has unusual duration "
+                f"of {outlier['duration']:.1f} seconds (z-score: {z_scores[position]:.2f})"
+            )
 
     # Check for premature ending (if we have audio duration)
     if audio_duration is not None:
-        last_token_end = token_info[-1]['end']
+        last_token_end = final_token['end']
         time_difference = audio_duration - last_token_end
 
         # If more than threshold seconds of audio remain after last token
@@ -102,39 +157,65 @@ def analyze_transcript_quality(words_data, audio_duration=None):
 
 def group_words_by_speaker(words_data):
     """Group words by speaker for transcript generation"""
+    if not isinstance(words_data, WordColumns):
+        # Building columns costs more than one pass over a plain word list
+        return _group_word_list_by_speaker(words_data)
+
+    columns = words_data
+
+    # Words need text and a start time
+    kept = np.flatnonzero(np.fromiter(map(bool, columns.texts), dtype=bool, count=len(columns))
+                          & ~np.isnan(columns.starts)).tolist()
+    speakers = columns.speakers.tolist()
+    starts = columns.starts.tolist()
+
+    speaker_segments = []
+    for speaker_code, group in groupby(kept, key=speakers.__getitem__):
+        indices = list(group)
+        speaker_segments.append({
+            'speaker': columns.speaker_names[speaker_code],
+            'start_time': starts[indices[0]],
+            'text_parts': [columns.texts[i] for i in indices]
+        })
+
+    return speaker_segments
+
+
+def _group_word_list_by_speaker(words_data):
+    """group_words_by_speaker for a list of word dicts/objects, in one pass"""
     speaker_segments = []
     current_segment = None
 
     for word_obj in words_data:
-        word_text_val = get_word_attr(word_obj, 'text')
-        word_start_val = get_word_attr(word_obj, 'start')
-        speaker_id_val = get_word_attr(word_obj, 'speaker_id', "speaker_unknown")
+        if isinstance(word_obj, dict):
+            word_text_val = word_obj.get('text')
+            word_start_val = word_obj.get('start')
+            speaker_id_val = word_obj.get('speaker_id', "speaker_unknown")
+        else:
+            word_text_val = getattr(word_obj, 'text', None)
+            word_start_val = getattr(word_obj, 'start', None)
+            speaker_id_val = getattr(word_obj, 'speaker_id', "speaker_unknown")
 
         if not (word_text_val and word_start_val is not None):
             continue
 
         if current_segment is None or current_segment['speaker'] != speaker_id_val:
-            if current_segment:
-                speaker_segments.append(current_segment)
             current_segment = {
                 'speaker': speaker_id_val,
                 'start_time': word_start_val,
                 'text_parts': [word_text_val]
             }
+            speaker_segments.append(current_segment)
         else:
             current_segment['text_parts'].append(word_text_val)
 
-    if current_segment:
-        speaker_segments.append(current_segment)
-
     return speaker_segments
 
 
 def count_unique_speakers(words_data):
     """Count unique speakers in the transcript"""
-    unique_speakers = set()
-    if words_data:
-        for word_obj in words_data:
-            speaker_id = get_word_attr(word_obj, 'speaker_id', "speaker_unknown")
-            unique_speakers.add(speaker_id)
-    return len(unique_speakers)
\ No newline at end of file
+    if not words_data:
+        return 0
+    if isinstance(words_data, WordColumns):
+        return len(words_data.speaker_names)
+    return len(set(word_attr_values(words_data, 'speaker_id', "speaker_unknown")))
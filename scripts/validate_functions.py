@@ -1,10 +1,50 @@
 #!/usr/bin/env python3
 """
-Function validation without external dependencies
-Extracts and tests core functions from app.py
+Function validation for the core functions extracted from app.py
+The extracted functions and case tables live here; tests/unit/test_extracted.py
+runs them as parametrized pytest tests
 """
 import re
 import os
+import sys
+import importlib.util
+
+EXTRACTED_TESTS = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests", "unit", "test_extracted.py"))
+
+SOURCE_CASES = (
+    ("https://drive.google.com/file/123", "drive"),
+    ("https://docs.google.com/document/456", "drive"),
+    ("https://dropbox.com/s/abc123", "dropbox"),
+    ("https://dropbox.com/transfer/xyz789", "dropbox_transfer"),
+    ("https://dropbox.com/t/test123", "dropbox_transfer"),
+    ("https://we.tl/t-abc123", "wetransfer"),
+    ("https://wetransfer.com/downloads/xyz", "wetransfer"),
+    ("https://example.com/file.mp3", "unknown"),
+)
+
+DROPBOX_CASES = (
+    ("https://dropbox.com/s/abc?dl=0", "https://dropbox.com/s/abc?dl=1"),
+    ("https://dropbox.com/s/abc", "https://dropbox.com/s/abc?dl=1"),
+    ("https://dropbox.com/s/abc?dl=1", "https://dropbox.com/s/abc?dl=1"),
+    ("https://dropbox.com/s/abc?param=value", "https://dropbox.com/s/abc?param=value&dl=1"),
+    ("https://example.com/file.mp3", "https://example.com/file.mp3"),
+)
+
+TXT_TIMESTAMP_CASES = (
+    (0, "00:00:00"),
+    (30, "00:00:30"),
+    (65, "00:01:05"),
+    (3661, "01:01:01"),
+    (None, "00:00:00"),
+)
+
+SRT_TIMESTAMP_CASES = (
+    (0, "00:00:00,000"),
+    (30.5, "00:00:30,500"),
+    (65.123, "00:01:05,123"),
+    (3661.567, "01:01:01,567"),
+    (None, "00:00:00,000"),
+)
 
 def detect_file_source(url):
     """Extracted function for testing"""
@@ -60,140 +100,28 @@ def format_srt_time(seconds_float):
     milliseconds = millis % 1000
     return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
 
-def run_validation_tests():
-    """Run validation tests on extracted functions"""
-    print("🧪 Running function validation tests...\n")
-
-    errors = []
-    tests_run = 0
-
-    # Test 1: File source detection
-    try:
-        print("Testing file source detection...")
-        test_cases = [
-            ("https://drive.google.com/file/123", "drive"),
-            ("https://docs.google.com/document/456", "drive"),
-            ("https://dropbox.com/s/abc123", "dropbox"),
-            ("https://dropbox.com/transfer/xyz789", "dropbox_transfer"),
-            ("https://dropbox.com/t/test123", "dropbox_transfer"),
-            ("https://we.tl/t-abc123", "wetransfer"),
-            ("https://wetransfer.com/downloads/xyz", "wetransfer"),
-            ("https://example.com/file.mp3", "unknown"),
-        ]
-
-        for url, expected in test_cases:
-            result = detect_file_source(url)
-            assert result == expected, f"Expected {expected}, got {result} for {url}"
-            tests_run += 1
-
-        print("✅ File source detection tests passed")
-
-    except Exception as e:
-        errors.append(f"File source detection: {e}")
-
-    # Test 2: Dropbox URL conversion
-    try:
-        print("Testing Dropbox URL conversion...")
-        test_cases = [
-            ("https://dropbox.com/s/abc?dl=0", "https://dropbox.com/s/abc?dl=1"),
-            ("https://dropbox.com/s/abc", "https://dropbox.com/s/abc?dl=1"),
-            ("https://dropbox.com/s/abc?dl=1", "https://dropbox.com/s/abc?dl=1"),
-            ("https://dropbox.com/s/abc?param=value", "https://dropbox.com/s/abc?param=value&dl=1"),
-            ("https://example.com/file.mp3", "https://example.com/file.mp3"),
-        ]
-
-        for input_url, expected in test_cases:
-            result = convert_dropbox_to_direct(input_url)
-            assert result == expected, f"Expected {expected}, got {result}"
-            tests_run += 1
-
-        print("✅ Dropbox URL conversion tests passed")
-
-    except Exception as e:
-        errors.append(f"Dropbox URL conversion: {e}")
-
-    # Test 3: Word attribute getter
-    try:
-        print("Testing word attribute getter...")
-
-        # Test with dict
-        word_dict = {"text": "hello", "start": 1.0, "speaker_id": "speaker_1"}
-        assert get_word_attr(word_dict, "text") == "hello"
-        assert get_word_attr(word_dict, "start") == 1.0
-        assert get_word_attr(word_dict, "missing", "default") == "default"
-        tests_run += 3
-
-        # Test with object-like structure
-        class MockWord:
-            def __init__(self):
-                self.text = "world"
-                self.start = 2.0
-
-        word_obj = MockWord()
-        assert get_word_attr(word_obj, "text") == "world"
-        assert get_word_attr(word_obj, "start") == 2.0
-        assert get_word_attr(word_obj, "missing", "default") == "default"
-        tests_run += 3
+def write_log(lines):
+    """Emit buffered report lines with a single write"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
-        print("✅ Word attribute getter tests passed")
-
-    except Exception as e:
-        errors.append(f"Word attribute getter: {e}")
-
-    # Test 4: Timestamp formatting
+def run_validation_tests():
+    """Run the parametrized extracted-function tests in tests/unit/test_extracted.py through pytest"""
     try:
-        print("Testing timestamp formatting...")
-
-        # TXT format tests
-        txt_cases = [
-            (0, "00:00:00"),
-            (30, "00:00:30"),
-            (65, "00:01:05"),
-            (3661, "01:01:01"),
-            (None, "00:00:00"),
-        ]
-
-        for seconds, expected in txt_cases:
-            result = format_txt_timestamp(seconds)
-            assert result == expected, f"TXT: Expected {expected}, got {result} for {seconds}"
-            tests_run += 1
-
-        # SRT format tests
-        srt_cases = [
-            (0, "00:00:00,000"),
-            (30.5, "00:00:30,500"),
-            (65.123, "00:01:05,123"),
-            (3661.567, "01:01:01,567"),
-            (None, "00:00:00,000"),
-        ]
-
-        for seconds, expected in srt_cases:
-            result = format_srt_time(seconds)
-            assert result == expected, f"SRT: Expected {expected}, got {result} for {seconds}"
-            tests_run += 1
-
-        print("✅ Timestamp formatting tests passed")
-
-    except Exception as e:
-        errors.append(f"Timestamp formatting: {e}")
-
-    # Summary
-    print(f"\n📊 Test Results:")
-    print(f"Total tests run: {tests_run}")
-
-    if not errors:
-        print("🎉 All validation tests passed!")
-        print("✅ Core functions are working correctly")
-        return True
-    else:
-        print(f"❌ {len(errors)} test group(s) failed:")
-        for error in errors:
-            print(f"   - {error}")
+        import pytest
+    except ImportError:
+        write_log(["❌ pytest is not installed; run: pip install -r requirements-test.txt"])
         return False
 
+    args = ["-q", EXTRACTED_TESTS]
+    if importlib.util.find_spec("xdist") is not None:
+        args += ["-n", "auto"]
+    return pytest.main(args) == 0
+
 def check_test_structure():
     """Validate our test structure"""
-    print("\n🔍 Checking test structure...")
+    log = []
+    log.append("\n🔍 Checking test structure...")
 
     required_files = [
         "tests/__init__.py",
@@ -207,19 +135,25 @@ def check_test_structure():
         "requirements-test.txt"
     ]
 
-    missing_files = []
-    for file_path in required_files:
-        if not os.path.exists(file_path):
-            missing_files.append(file_path)
+    # One directory sweep instead of a stat call per required file
+    present = set()
+    for root, _, files in os.walk("tests"):
+        for name in files:
+            present.add(os.path.join(root, name).replace(os.sep, "/"))
+    with os.scandir(".") as entries:
+        present.update(entry.name for entry in entries if entry.is_file())
+
+    missing_files = [file_path for file_path in required_files if file_path not in present]
 
     if missing_files:
-        print(f"❌ Missing test files:")
+        log.append(f"❌ Missing test files:")
         for file_path in missing_files:
-            print(f"   - {file_path}")
-        return False
+            log.append(f"   - {file_path}")
     else:
-        print("✅ All test structure files are present")
-        return True
+        log.append("✅ All test structure files are present")
+
+    write_log(log)
+    return not missing_files
 
 if __name__ == "__main__":
     print("=" * 60)
@@ -3,17 +3,64 @@ Audio processing service for conversion and duration extraction
 """
 import subprocess
 import os
+import glob
+import tempfile
 from config.settings import (
     DEFAULT_SAMPLE_RATE,
     DEFAULT_CHANNELS,
     HIGH_QUALITY_BITRATE,
     STANDARD_MP3_SAMPLE_RATE,
-    MAX_WAV_SIZE_BYTES
+    MAX_WAV_SIZE_BYTES,
+    CHUNK_DURATION_SECONDS
 )
 
+try:
+    from mutagen import File as MutagenFile
+except ImportError:  # mutagen is optional; ffprobe is always available as a fallback
+    MutagenFile = None
+
+try:
+    import av
+except ImportError:  # PyAV is optional; covers containers mutagen cannot parse
+    av = None
+
+def read_header_duration(file_path):
+    """Read duration from the container header in-process, or None if unsupported"""
+    if MutagenFile is None:
+        return None
+    try:
+        media = MutagenFile(file_path)
+    except Exception:
+        return None
+    if media is None or getattr(media, 'info', None) is None:
+        return None
+    return media.info.length or None
+
+
+def read_container_duration(file_path):
+    """Read duration with PyAV (libavformat) in-process, or None if unavailable"""
+    if av is None:
+        return None
+    try:
+        with av.open(file_path) as container:
+            duration = container.duration
+    except Exception:
+        return None
+    if not duration:
+        return None
+    return duration / av.time_base
+
 
 def get_audio_duration(file_path):
-    """Get duration of audio/video file using ffprobe"""
+    """Get duration of audio/video file in-process, falling back to ffprobe"""
+    duration = read_header_duration(file_path)
+    if duration is not None:
+        return duration
+
+    duration = read_container_duration(file_path)
+    if duration is not None:
+        return duration
+
     try:
         cmd = [
             'ffprobe', '-v', 'error', '-show_entries',
@@ -99,10 +146,45 @@ def process_audio_file(source_file_path, temp_dir, base_filename):
         convert_to_mp3(wav_path, mp3_path)
 
         # Clean up the oversized WAV file
-        if os.path.exists(wav_path):
+        try:
             os.remove(wav_path)
+        except FileNotFoundError:
+            pass
 
         return mp3_path
     else:
         # The WAV file is acceptable size
-        return wav_path
\ No newline at end of file
+        return wav_path
+
+
+def split_audio_file(audio_path, temp_dir, base_filename, chunk_seconds=CHUNK_DURATION_SECONDS):
+    """
+    Split an audio file into consecutive fixed-length chunks without re-encoding
+
+    Returns:
+        list: (chunk_path, chunk_start_seconds) tuples in playback order
+    """
+    ext = os.path.splitext(audio_path)[1]
+    # A fresh directory per split, so leftovers from an earlier run are never picked up
+    chunk_dir = tempfile.mkdtemp(prefix=f"{base_filename}_chunks_", dir=temp_dir)
+    pattern = os.path.join(chunk_dir, f"{base_filename}_chunk_%03d{ext}")
+    command = [
+        "ffmpeg", "-i", audio_path,
+        "-f", "segment",
+        "-segment_time", str(chunk_seconds),
+        "-c", "copy",
+        "-y", pattern
+    ]
+    try:
+        subprocess.run(command, capture_output=True, text=True, check=True)
+    except FileNotFoundError:
+        raise Exception("FFmpeg is not installed or not found in PATH. Please install FFmpeg:\n"
+                       "- Ubuntu/Debian: sudo apt install ffmpeg\n"
+                       "- macOS: brew install ffmpeg\n"
+                       "- Windows: Download from https://ffmpeg.org/download.html")
+
+    chunk_paths = sorted(glob.glob(os.path.join(chunk_dir, f"{base_filename}_chunk_*{ext}")))
+    if not chunk_paths:
+        raise Exception(f"FFmpeg produced no audio chunks for {audio_path}")
+    print(f"✅ Split audio into {len(chunk_paths)} chunks")
+    return [(path, index * chunk_seconds) for index, path in enumerate(chunk_paths)]
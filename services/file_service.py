@@ -4,6 +4,122 @@ File service for packaging and download preparation
 import os
 import zipfile
 import tempfile
+from config.settings import COMPRESSIBLE_ARCHIVE_EXTENSIONS, MAX_SERVED_OUTPUT_DIRS
+
+# Output directories created by this process, oldest first (dict keys keep
+# insertion order); only files inside them may be streamed through the
+# /download-zip endpoint
+_OUTPUT_DIRS = {}
+
+
+class _ChunkSink:
+    """Write-only, non-seekable file object that buffers ZIP output for streaming"""
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """Return and clear everything written since the last drain"""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def register_output_dir(directory):
+    """Allow files inside directory to be served, forgetting the oldest job dirs past the limit"""
+    _OUTPUT_DIRS[os.path.realpath(directory)] = None
+    while len(_OUTPUT_DIRS) > MAX_SERVED_OUTPUT_DIRS:
+        release_output_dir(next(iter(_OUTPUT_DIRS)))
+
+
+def release_output_dir(directory):
+    """Stop serving files from a job's output directory; the files stay on disk"""
+    _OUTPUT_DIRS.pop(os.path.realpath(directory), None)
+
+
+def is_servable_path(file_path):
+    """Check that file_path exists and lives in a registered output directory"""
+    real_path = os.path.realpath(file_path)
+    return (os.path.dirname(real_path) in _OUTPUT_DIRS) and os.path.isfile(real_path)
+
+
+def existing_paths(paths):
+    """
+    Return the subset of paths that exist, listing each parent directory once
+
+    Output files share a session directory, so one scandir replaces a stat per file.
+    """
+    by_directory = {}
+    for file_path in paths:
+        by_directory.setdefault(os.path.dirname(file_path) or ".", []).append(file_path)
+
+    found = set()
+    for directory, directory_paths in by_directory.items():
+        try:
+            with os.scandir(directory) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            continue
+        found.update(p for p in directory_paths if os.path.basename(p) in names)
+
+    return found
+
+
+def archive_compression(file_path):
+    """Pick the ZIP compression for a file: deflate text, store already-compressed audio"""
+    if file_path.lower().endswith(COMPRESSIBLE_ARCHIVE_EXTENSIONS):
+        return zipfile.ZIP_DEFLATED
+    return zipfile.ZIP_STORED
+
+
+def stream_zip(selected_paths, names, chunk_size=1024 * 1024):
+    """
+    Build a ZIP archive on the fly and yield it as byte chunks
+
+    Nothing is staged on disk, so the transfer starts as soon as the first
+    entry is compressed.
+
+    Args:
+        selected_paths: Paths of the files to include
+        names: Archive names for each file (same order as selected_paths)
+        chunk_size: Bytes read from each source file per iteration
+
+    Yields:
+        bytes: Consecutive pieces of the ZIP archive
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w') as zf:
+        for file_path, name in zip(selected_paths, names):
+            info = zipfile.ZipInfo.from_file(file_path, name)
+            info.compress_type = archive_compression(file_path)
+            with open(file_path, 'rb') as src, zf.open(info, 'w') as dest:
+                while True:
+                    block = src.read(chunk_size)
+                    if not block:
+                        break
+                    dest.write(block)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    # Central directory is written when the archive is closed
+    data = sink.drain()
+    if data:
+        yield data
 
 
 def handle_download_selection(txt_selected, srt_selected, audio_selected, json_selected,
@@ -15,24 +131,18 @@ def handle_download_selection(txt_selected, srt_selected, audio_selected, json_s
         return None, "❌ No files processed yet"
 
     # Count selected files
-    selected_files = []
-    selected_paths = []
-
-    if txt_selected and txt_path and os.path.exists(txt_path):
-        selected_files.append(os.path.basename(txt_path))
-        selected_paths.append(txt_path)
-
-    if srt_selected and srt_path and os.path.exists(srt_path):
-        selected_files.append(os.path.basename(srt_path))
-        selected_paths.append(srt_path)
-
-    if audio_selected and audio_path and os.path.exists(audio_path):
-        selected_files.append(os.path.basename(audio_path))
-        selected_paths.append(audio_path)
+    candidates = [
+        file_path for selected, file_path in (
+            (txt_selected, txt_path),
+            (srt_selected, srt_path),
+            (audio_selected, audio_path),
+            (json_selected, json_path)
+        ) if selected and file_path
+    ]
+    existing = existing_paths(candidates)
 
-    if json_selected and json_path and os.path.exists(json_path):
-        selected_files.append(os.path.basename(json_path))
-        selected_paths.append(json_path)
+    selected_paths = [file_path for file_path in candidates if file_path in existing]
+    selected_files = [os.path.basename(file_path) for file_path in selected_paths]
 
     if not selected_files:
         return None, "❌ No files selected for download"
@@ -49,9 +159,9 @@ def handle_download_selection(txt_selected, srt_selected, audio_selected, json_s
         zip_filename = f"{clean_episode_name}_selected_files.zip"
         zip_path = os.path.join(temp_dir, zip_filename)
 
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        with zipfile.ZipFile(zip_path, 'w') as zf:
             for file_path in selected_paths:
-                zf.write(file_path, os.path.basename(file_path))
+                zf.write(file_path, os.path.basename(file_path), compress_type=archive_compression(file_path))
 
         file_list = ", ".join(selected_files)
         return zip_path, f"✅ Created ZIP with {len(selected_files)} files: {file_list}"
\ No newline at end of file
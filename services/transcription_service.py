@@ -1,8 +1,99 @@
 """
 Transcription service using ElevenLabs API
 """
+import os
+import json
+import asyncio
+import hashlib
+import tempfile
+import mimetypes
+from functools import lru_cache
 import httpx
-from elevenlabs.client import ElevenLabs
+from pydantic import ValidationError
+from elevenlabs import SpeechToTextChunkResponseModel
+from elevenlabs.client import ElevenLabs, AsyncElevenLabs
+from config.settings import (
+    UPLOAD_BUFFER_SIZE,
+    MAX_KEEPALIVE_CONNECTIONS,
+    MAX_CONCURRENT_TRANSCRIPTIONS,
+    TRANSCRIPTION_MODEL_ID,
+    TRANSCRIPTION_CACHE_DIR
+)
+
+HTTP_TIMEOUT = httpx.Timeout(60.0, read=900.0, connect=10.0)
+
+# Shared HTTP client so consecutive transcriptions reuse pooled HTTP/2 connections
+_http_client = None
+
+
+def get_http_client():
+    """Return the process-wide httpx client used for ElevenLabs requests"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(
+            http2=True,
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS)
+        )
+    return _http_client
+
+
+@lru_cache(maxsize=8)
+def get_elevenlabs_client(api_key):
+    """Return a cached ElevenLabs client for api_key, built on the shared HTTP client"""
+    http_client = get_http_client()
+    return ElevenLabs(api_key=api_key, timeout=http_client.timeout, httpx_client=http_client)
+
+
+def hash_audio_file(audio_file_path):
+    """Hash an audio file's contents in a single streaming pass"""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(audio_file_path, "rb") as f:
+        for block in iter(lambda: f.read(UPLOAD_BUFFER_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def get_cache_path(audio_file_path, language_code, diarize):
+    """Return the cache file for an audio file and transcription settings"""
+    audio_hash = hash_audio_file(audio_file_path)
+    cache_name = f"{audio_hash}_{TRANSCRIPTION_MODEL_ID}_{language_code}_{int(bool(diarize))}.json"
+    return os.path.join(TRANSCRIPTION_CACHE_DIR, cache_name)
+
+
+def load_cached_response(cache_path):
+    """Read a cached transcription response, discarding unreadable entries"""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            response = SpeechToTextChunkResponseModel.model_validate(json.load(f))
+    except (OSError, ValueError, ValidationError) as e:
+        print(f"⚠️ Ignoring unreadable cached transcription {cache_path}: {e}")
+        try:
+            os.remove(cache_path)
+        except OSError:
+            pass
+        return None
+    print(f"✅ Loaded cached transcription: {cache_path}")
+    return response
+
+
+def save_cached_response(cache_path, response):
+    """Write a transcription response to the cache, ignoring filesystem errors"""
+    tmp_path = None
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Unique temp file per write, so concurrent jobs never interleave into one file
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(response.model_dump(mode="json"), f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not cache transcription: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 
 class TranscriptionService:
@@ -11,8 +102,7 @@ class TranscriptionService:
     def __init__(self, api_key):
         """Initialize the transcription service with API key"""
         self.api_key = api_key
-        custom_timeout = httpx.Timeout(60.0, read=900.0, connect=10.0)
-        self.client = ElevenLabs(api_key=api_key, timeout=custom_timeout)
+        self.client = get_elevenlabs_client(api_key)
 
     def transcribe_audio(self, audio_file_path, language_code="en", diarize=True):
         """
@@ -26,18 +116,79 @@ class TranscriptionService:
         Returns:
             Transcription response object with text and words
         """
-        with open(audio_file_path, "rb") as audio_file_object:
+        cache_path = get_cache_path(audio_file_path, language_code, diarize)
+        cached_response = load_cached_response(cache_path)
+        if cached_response is not None:
+            return cached_response
+
+        # Large read buffer so httpx streams the multipart body from disk in big blocks
+        with open(audio_file_path, "rb", buffering=UPLOAD_BUFFER_SIZE) as audio_file_object:
             response = self.client.speech_to_text.convert(
-                file=audio_file_object,
-                model_id="scribe_v1_experimental",
-                language_code=language_code,
-                diarize=diarize,
-                tag_audio_events=False,
-                timestamps_granularity="word"
+                **self._convert_kwargs(audio_file_path, audio_file_object, language_code, diarize)
             )
 
+        save_cached_response(cache_path, response)
         return response
 
+    async def transcribe_audio_parallel(self, chunk_paths, language_code="en", diarize=True):
+        """
+        Transcribe audio chunks concurrently and stitch them into one response
+
+        Args:
+            chunk_paths: List of (chunk_path, chunk_start_seconds) tuples in playback order
+            language_code: Language code for transcription
+            diarize: Whether to perform speaker diarization (speaker IDs are per chunk)
+
+        Returns:
+            Transcription response object with text and words for the whole recording
+        """
+        if not chunk_paths:
+            raise ValueError("No audio chunks to transcribe")
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSCRIPTIONS)
+
+        # Async clients are bound to the running event loop, so one is opened per run
+        async with httpx.AsyncClient(
+            http2=True,
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS)
+        ) as http_client:
+            async_client = AsyncElevenLabs(api_key=self.api_key, timeout=HTTP_TIMEOUT, httpx_client=http_client)
+
+            async def transcribe_chunk(chunk_path, chunk_start_seconds):
+                async with semaphore:
+                    with open(chunk_path, "rb", buffering=UPLOAD_BUFFER_SIZE) as audio_file_object:
+                        response = await async_client.speech_to_text.convert(
+                            **self._convert_kwargs(chunk_path, audio_file_object, language_code, diarize)
+                        )
+                return _offset_words(response, chunk_start_seconds)
+
+            responses = await asyncio.gather(
+                *(transcribe_chunk(path, start) for path, start in chunk_paths)
+            )
+
+        words = [word for response in responses for word in (response.words or [])]
+        text = " ".join(response.text.strip() for response in responses if response.text)
+        return responses[0].model_copy(update={"text": text, "words": words})
+
+    def transcribe_audio_chunked(self, chunk_paths, language_code="en", diarize=True):
+        """Synchronous wrapper around transcribe_audio_parallel"""
+        return asyncio.run(self.transcribe_audio_parallel(chunk_paths, language_code, diarize))
+
+    @staticmethod
+    def _convert_kwargs(audio_file_path, audio_file_object, language_code, diarize):
+        """Build the speech_to_text.convert arguments for one audio file"""
+        file_name = os.path.basename(audio_file_path)
+        content_type = mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+        return {
+            "file": (file_name, audio_file_object, content_type),
+            "model_id": TRANSCRIPTION_MODEL_ID,
+            "language_code": language_code,
+            "diarize": diarize,
+            "tag_audio_events": False,
+            "timestamps_granularity": "word"
+        }
+
     def extract_transcription_data(self, response):
         """
         Extract text and words data from transcription response
@@ -48,15 +199,35 @@ class TranscriptionService:
         Returns:
             tuple: (full_transcript_text, words_data, response_dict)
         """
-        full_transcript_text = ""
-        words_data = []
+        try:
+            full_transcript_text = response.text or ""
+        except AttributeError:
+            full_transcript_text = ""
+
+        # Keep the already-parsed word models; they are only serialized once below
+        try:
+            words_data = response.words or []
+        except AttributeError:
+            words_data = []
 
-        if hasattr(response, 'text'):
-            full_transcript_text = response.text
-        if hasattr(response, 'words'):
-            words_data = response.words
+        # Convert to a JSON-ready dictionary for caching
+        response_dict = response.model_dump(mode="json")
+
+        return full_transcript_text, words_data, response_dict
+
+
+def _offset_words(response, offset_seconds):
+    """Shift every word timestamp in a chunk response by the chunk start time"""
+    if not offset_seconds or not response.words:
+        return response
 
-        # Convert to dictionary for caching
-        response_dict = response.model_dump()
+    words = []
+    for word in response.words:
+        update = {}
+        if word.start is not None:
+            update["start"] = word.start + offset_seconds
+        if word.end is not None:
+            update["end"] = word.end + offset_seconds
+        words.append(word.model_copy(update=update))
 
-        return full_transcript_text, words_data, response_dict
\ No newline at end of file
+    return response.model_copy(update={"words": words})
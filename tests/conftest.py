@@ -2,68 +2,54 @@
 Pytest configuration and shared fixtures
 """
 import pytest
-import tempfile
 import os
 import json
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, mock_open
 
 
+@pytest.fixture(scope="module")
+def temp_dir(tmp_path_factory):
+    """Create a temporary directory for test files, shared by the tests in a module"""
+    return str(tmp_path_factory.mktemp("test_files"))
+
+
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for test files"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
+def isolated_transcription_cache(tmp_path, monkeypatch):
+    """Point the transcription cache at a per-test directory"""
+    import services.transcription_service as transcription_service
+    monkeypatch.setattr(transcription_service, "TRANSCRIPTION_CACHE_DIR", str(tmp_path / "transcription_cache"))
 
 
 @pytest.fixture
+def isolated_elevenlabs_clients():
+    """Drop cached ElevenLabs clients so each test sees its own mocks"""
+    import services.transcription_service as transcription_service
+    transcription_service.get_elevenlabs_client.cache_clear()
+    yield
+    transcription_service.get_elevenlabs_client.cache_clear()
+
+
+SAMPLE_TRANSCRIPT_TEXT = "Hello world this is a test transcript"
+
+# Shared word data for the sample transcript fixtures
+SAMPLE_WORDS = (
+    {"text": "Hello", "start": 0.0, "end": 0.5, "speaker_id": "speaker_1"},
+    {"text": "world", "start": 0.6, "end": 1.0, "speaker_id": "speaker_1"},
+    {"text": "this", "start": 1.1, "end": 1.3, "speaker_id": "speaker_2"},
+    {"text": "is", "start": 1.4, "end": 1.6, "speaker_id": "speaker_2"},
+    {"text": "a", "start": 1.7, "end": 1.8, "speaker_id": "speaker_2"},
+    {"text": "test", "start": 1.9, "end": 2.2, "speaker_id": "speaker_2"},
+    {"text": "transcript", "start": 2.3, "end": 2.8, "speaker_id": "speaker_2"}
+)
+
+
+@pytest.fixture(scope="session")
 def sample_elevenlabs_response():
     """Mock ElevenLabs API response data"""
     return {
-        "text": "Hello world this is a test transcript",
-        "words": [
-            {
-                "text": "Hello",
-                "start": 0.0,
-                "end": 0.5,
-                "speaker_id": "speaker_1"
-            },
-            {
-                "text": "world",
-                "start": 0.6,
-                "end": 1.0,
-                "speaker_id": "speaker_1"
-            },
-            {
-                "text": "this",
-                "start": 1.1,
-                "end": 1.3,
-                "speaker_id": "speaker_2"
-            },
-            {
-                "text": "is",
-                "start": 1.4,
-                "end": 1.6,
-                "speaker_id": "speaker_2"
-            },
-            {
-                "text": "a",
-                "start": 1.7,
-                "end": 1.8,
-                "speaker_id": "speaker_2"
-            },
-            {
-                "text": "test",
-                "start": 1.9,
-                "end": 2.2,
-                "speaker_id": "speaker_2"
-            },
-            {
-                "text": "transcript",
-                "start": 2.3,
-                "end": 2.8,
-                "speaker_id": "speaker_2"
-            }
-        ]
+        "text": SAMPLE_TRANSCRIPT_TEXT,
+        "words": [dict(word) for word in SAMPLE_WORDS]
     }
 
 
@@ -76,27 +62,11 @@ def mock_elevenlabs_client():
 
         # Mock the transcription response
         mock_response = Mock()
-        mock_response.text = "Hello world this is a test transcript"
-        mock_response.words = [
-            Mock(text="Hello", start=0.0, end=0.5, speaker_id="speaker_1"),
-            Mock(text="world", start=0.6, end=1.0, speaker_id="speaker_1"),
-            Mock(text="this", start=1.1, end=1.3, speaker_id="speaker_2"),
-            Mock(text="is", start=1.4, end=1.6, speaker_id="speaker_2"),
-            Mock(text="a", start=1.7, end=1.8, speaker_id="speaker_2"),
-            Mock(text="test", start=1.9, end=2.2, speaker_id="speaker_2"),
-            Mock(text="transcript", start=2.3, end=2.8, speaker_id="speaker_2")
-        ]
+        mock_response.text = SAMPLE_TRANSCRIPT_TEXT
+        mock_response.words = [SimpleNamespace(**word) for word in SAMPLE_WORDS]
         mock_response.model_dump.return_value = {
-            "text": "Hello world this is a test transcript",
-            "words": [
-                {"text": "Hello", "start": 0.0, "end": 0.5, "speaker_id": "speaker_1"},
-                {"text": "world", "start": 0.6, "end": 1.0, "speaker_id": "speaker_1"},
-                {"text": "this", "start": 1.1, "end": 1.3, "speaker_id": "speaker_2"},
-                {"text": "is", "start": 1.4, "end": 1.6, "speaker_id": "speaker_2"},
-                {"text": "a", "start": 1.7, "end": 1.8, "speaker_id": "speaker_2"},
-                {"text": "test", "start": 1.9, "end": 2.2, "speaker_id": "speaker_2"},
-                {"text": "transcript", "start": 2.3, "end": 2.8, "speaker_id": "speaker_2"}
-            ]
+            "text": SAMPLE_TRANSCRIPT_TEXT,
+            "words": [dict(word) for word in SAMPLE_WORDS]
         }
 
         mock_instance.speech_to_text.convert.return_value = mock_response
@@ -113,6 +83,13 @@ def mock_subprocess():
         yield mock_run
 
 
+@pytest.fixture
+def mock_ffprobe():
+    """Mock subprocess.run for ffprobe tests; each test configures it from scratch"""
+    with patch('subprocess.run') as mock_run:
+        yield mock_run
+
+
 @pytest.fixture
 def mock_requests():
     """Mock requests for file downloads"""
@@ -125,14 +102,6 @@ def mock_requests():
         yield mock_get
 
 
-@pytest.fixture
-def mock_gdown():
-    """Mock gdown for Google Drive downloads"""
-    with patch('gdown.download') as mock_download:
-        mock_download.return_value = "/tmp/test_file.mp3"
-        yield mock_download
-
-
 @pytest.fixture
 def sample_audio_file(temp_dir):
     """Create a sample audio file for testing"""
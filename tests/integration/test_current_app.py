@@ -10,86 +10,61 @@ from unittest.mock import patch, Mock, mock_open
 import sys
 
 # Add the project root to Python path to import app
+
+# These tests build TranscriptionService objects, so keep the cache and client pool per test
+pytestmark = pytest.mark.usefixtures("isolated_transcription_cache", "isolated_elevenlabs_clients")
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 import app
 
 
+URL_CLASSIFICATION_CASES = [
+    ("https://drive.google.com/file/d/123/view", 'drive'),
+    ("https://docs.google.com/document/d/456/edit", 'drive'),
+    ("https://dropbox.com/s/abc123/file.mp3", 'dropbox'),
+    ("https://www.dropbox.com/sh/xyz/folder", 'dropbox'),
+    ("https://dropbox.com/transfer/abc123", 'dropbox_transfer'),
+    ("https://dropbox.com/t/xyz789", 'dropbox_transfer'),
+    ("https://we.tl/t-abc123", 'wetransfer'),
+    ("https://wetransfer.com/downloads/xyz789", 'wetransfer'),
+    ("https://example.com/file.mp3", 'unknown'),
+    ("https://youtube.com/watch?v=123", 'unknown'),
+]
+
+DROPBOX_CONVERSION_CASES = [
+    # dl=0 becomes dl=1
+    ("https://dropbox.com/s/abc123/file.mp3?dl=0", "https://dropbox.com/s/abc123/file.mp3?dl=1"),
+    # dl=1 is added when missing
+    ("https://dropbox.com/s/abc123/file.mp3", "https://dropbox.com/s/abc123/file.mp3?dl=1"),
+    # existing dl=1 is preserved
+    ("https://dropbox.com/s/abc123/file.mp3?dl=1", "https://dropbox.com/s/abc123/file.mp3?dl=1"),
+    # non-Dropbox URLs are unchanged
+    ("https://example.com/file.mp3", "https://example.com/file.mp3"),
+]
+
+
 @pytest.mark.integration
+@pytest.mark.xdist_group("url_utils")
 class TestFileSourceDetection:
     """Test file source detection functionality"""
 
-    def test_detect_google_drive_urls(self):
-        """Test detection of Google Drive URLs"""
-        urls = [
-            "https://drive.google.com/file/d/123/view",
-            "https://docs.google.com/document/d/456/edit"
-        ]
-        for url in urls:
-            assert app.detect_file_source(url) == 'drive'
-
-    def test_detect_dropbox_urls(self):
-        """Test detection of Dropbox URLs"""
-        urls = [
-            "https://dropbox.com/s/abc123/file.mp3",
-            "https://www.dropbox.com/sh/xyz/folder"
-        ]
-        for url in urls:
-            assert app.detect_file_source(url) == 'dropbox'
-
-    def test_detect_dropbox_transfer_urls(self):
-        """Test detection of Dropbox Transfer URLs"""
-        urls = [
-            "https://dropbox.com/transfer/abc123",
-            "https://dropbox.com/t/xyz789"
-        ]
-        for url in urls:
-            assert app.detect_file_source(url) == 'dropbox_transfer'
-
-    def test_detect_wetransfer_urls(self):
-        """Test detection of WeTransfer URLs"""
-        urls = [
-            "https://we.tl/t-abc123",
-            "https://wetransfer.com/downloads/xyz789"
-        ]
-        for url in urls:
-            assert app.detect_file_source(url) == 'wetransfer'
-
-    def test_detect_unknown_urls(self):
-        """Test detection of unknown URLs"""
-        urls = [
-            "https://example.com/file.mp3",
-            "https://youtube.com/watch?v=123"
-        ]
-        for url in urls:
-            assert app.detect_file_source(url) == 'unknown'
+    @pytest.mark.parametrize("url,expected", URL_CLASSIFICATION_CASES,
+                             ids=[url for url, _ in URL_CLASSIFICATION_CASES])
+    def test_url_classification(self, url, expected):
+        """Test detection of each supported source and unknown URLs"""
+        assert app.detect_file_source(url) == expected
 
 
 @pytest.mark.integration
+@pytest.mark.xdist_group("url_utils")
 class TestDropboxUrlConversion:
     """Test Dropbox URL conversion functionality"""
 
-    def test_convert_dl_0_to_dl_1(self):
-        """Test converting dl=0 to dl=1"""
-        input_url = "https://dropbox.com/s/abc123/file.mp3?dl=0"
-        expected = "https://dropbox.com/s/abc123/file.mp3?dl=1"
-        assert app.convert_dropbox_to_direct(input_url) == expected
-
-    def test_add_dl_1_when_missing(self):
-        """Test adding dl=1 when not present"""
-        input_url = "https://dropbox.com/s/abc123/file.mp3"
-        expected = "https://dropbox.com/s/abc123/file.mp3?dl=1"
+    @pytest.mark.parametrize("input_url,expected", DROPBOX_CONVERSION_CASES,
+                             ids=[url for url, _ in DROPBOX_CONVERSION_CASES])
+    def test_convert_dropbox_to_direct(self, input_url, expected):
+        """Test Dropbox share links are rewritten to direct downloads"""
         assert app.convert_dropbox_to_direct(input_url) == expected
 
-    def test_preserve_existing_dl_1(self):
-        """Test preserving existing dl=1"""
-        input_url = "https://dropbox.com/s/abc123/file.mp3?dl=1"
-        assert app.convert_dropbox_to_direct(input_url) == input_url
-
-    def test_non_dropbox_url_unchanged(self):
-        """Test non-Dropbox URLs remain unchanged"""
-        input_url = "https://example.com/file.mp3"
-        assert app.convert_dropbox_to_direct(input_url) == input_url
-
 
 @pytest.mark.integration
 class TestUtilityFunctions:
@@ -220,15 +195,14 @@ class TestDropboxTransferHandling:
 class TestFileDownloadOrchestration:
     """Test the main file download orchestration"""
 
-    @patch('app.gdown.download')
-    def test_download_file_from_source_drive(self, mock_gdown, temp_dir):
+    @patch('services.download_service.download_from_google_drive')
+    def test_download_file_from_source_drive(self, mock_drive, temp_dir):
         """Test downloading from Google Drive"""
         output_path = os.path.join(temp_dir, "test.mp3")
-        mock_gdown.return_value = output_path
 
         result = app.download_file_from_source("https://drive.google.com/file/123", output_path, 'drive')
         assert result == output_path
-        mock_gdown.assert_called_once()
+        mock_drive.assert_called_once_with("https://drive.google.com/file/123", output_path)
 
     @patch('app.download_from_dropbox')
     def test_download_file_from_source_dropbox(self, mock_dropbox, temp_dir):
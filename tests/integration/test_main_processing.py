@@ -10,10 +10,23 @@ from unittest.mock import patch, Mock, mock_open
 import sys
 
 # Add the project root to Python path to import app
+
+# These tests build TranscriptionService objects, so keep the cache and client pool per test
+pytestmark = pytest.mark.usefixtures("isolated_transcription_cache", "isolated_elevenlabs_clients")
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 import app
 
 
+class _NoopProgress:
+    """Stand-in for gr.Progress that ignores every update"""
+
+    def __call__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        return self
+
+
 @pytest.mark.integration
 class TestMainProcessingWorkflow:
     """Test the main process_transcript_complete function"""
@@ -25,8 +38,8 @@ class TestMainProcessingWorkflow:
         with open(json_file, 'w') as f:
             json.dump(sample_elevenlabs_response, f)
 
-        # Mock gradio progress
-        mock_progress = Mock()
+        # Stub gradio progress
+        mock_progress = _NoopProgress()
 
         result = app.process_transcript_complete(
             episode_name="test_episode",
@@ -63,7 +76,7 @@ class TestMainProcessingWorkflow:
 
         mock_download.return_value = json_file
 
-        mock_progress = Mock()
+        mock_progress = _NoopProgress()
 
         result = app.process_transcript_complete(
             episode_name="test_episode",
@@ -87,7 +100,7 @@ class TestMainProcessingWorkflow:
         mock_subprocess.return_value.returncode = 0
         mock_subprocess.return_value.stdout = "5.5"
 
-        mock_progress = Mock()
+        mock_progress = _NoopProgress()
 
         result = app.process_transcript_complete(
             episode_name="test_episode",
@@ -114,7 +127,7 @@ class TestMainProcessingWorkflow:
 
     def test_process_validation_errors(self):
         """Test input validation errors"""
-        mock_progress = Mock()
+        mock_progress = _NoopProgress()
 
         # Test missing episode name
         result = app.process_transcript_complete(
@@ -175,7 +188,7 @@ class TestMainProcessingWorkflow:
         with open(invalid_json_file, 'w') as f:
             f.write('{"invalid": "format"}')
 
-        mock_progress = Mock()
+        mock_progress = _NoopProgress()
 
         result = app.process_transcript_complete(
             episode_name="test_episode",
@@ -204,7 +217,7 @@ class TestMainProcessingWorkflow:
         mock_elevenlabs.return_value = mock_client
         mock_client.speech_to_text.convert.side_effect = Exception("API Error")
 
-        mock_progress = Mock()
+        mock_progress = _NoopProgress()
 
         result = app.process_transcript_complete(
             episode_name="test_episode",
@@ -244,7 +257,7 @@ class TestMainProcessingWorkflow:
         with patch('os.path.getsize') as mock_getsize:
             mock_getsize.return_value = 2 * 1024 * 1024 * 1024  # 2GB
 
-            mock_progress = Mock()
+            mock_progress = _NoopProgress()
 
             result = app.process_transcript_complete(
                 episode_name="test_episode",
@@ -319,6 +332,34 @@ class TestDownloadSelection:
         assert "Created ZIP with 2 files" in status
         assert os.path.exists(download_path)
 
+    def test_stream_zip_multiple_files(self, temp_dir):
+        """Test streaming a ZIP archive without staging it on disk"""
+        import io
+        import zipfile
+
+        txt_file = os.path.join(temp_dir, "test_transcript.txt")
+        srt_file = os.path.join(temp_dir, "test_subtitles.srt")
+
+        with open(txt_file, 'w') as f:
+            f.write("Test transcript")
+        with open(srt_file, 'w') as f:
+            f.write("Test subtitles")
+
+        audio_file = os.path.join(temp_dir, "test_audio.mp3")
+        with open(audio_file, 'wb') as f:
+            f.write(b"ID3" + b"\x00" * 100)
+
+        chunks = list(app.stream_zip([txt_file, srt_file, audio_file],
+                                     ["test_transcript.txt", "test_subtitles.srt", "test_audio.mp3"]))
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zf:
+            assert zf.namelist() == ["test_transcript.txt", "test_subtitles.srt", "test_audio.mp3"]
+            assert zf.read("test_transcript.txt") == b"Test transcript"
+            assert zf.read("test_audio.mp3") == b"ID3" + b"\x00" * 100
+            # Text is deflated, audio is stored without recompression
+            assert zf.getinfo("test_transcript.txt").compress_type == zipfile.ZIP_DEFLATED
+            assert zf.getinfo("test_audio.mp3").compress_type == zipfile.ZIP_STORED
+
     def test_handle_download_selection_no_files(self):
         """Test error when no files selected"""
         result = app.handle_download_selection(
@@ -353,4 +394,92 @@ class TestDownloadSelection:
 
         download_path, status = result
         assert download_path is None
-        assert "No files processed yet" in status
\ No newline at end of file
+        assert "No files processed yet" in status
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient for the FastAPI app with a minimal Gradio interface mounted"""
+    import gradio as gr
+    from fastapi.testclient import TestClient
+    with gr.Blocks() as interface:
+        gr.Markdown("test")
+    return TestClient(app.create_app(interface))
+
+
+@pytest.mark.integration
+class TestDownloadZipEndpoint:
+    """Test the /download-zip endpoint and the output directory registry behind it"""
+
+    @pytest.fixture
+    def output_dir(self, tmp_path, monkeypatch):
+        import services.file_service as file_service
+        monkeypatch.setattr(file_service, "_OUTPUT_DIRS", {})
+        directory = tmp_path / "job"
+        directory.mkdir()
+        (directory / "ep_transcript.txt").write_text("Test transcript")
+        (directory / "ep_subtitles.srt").write_text("Test subtitles")
+        file_service.register_output_dir(str(directory))
+        return directory
+
+    @pytest.fixture
+    def outside_file(self, tmp_path):
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        secret = outside / "secret.txt"
+        secret.write_text("not for download")
+        return secret
+
+    def test_download_zip_registered_files(self, client, output_dir):
+        import io
+        import zipfile
+
+        response = client.get("/download-zip", params={
+            "path": [str(output_dir / "ep_transcript.txt"), str(output_dir / "ep_subtitles.srt")],
+            "episode_name": "ep"
+        })
+
+        assert response.status_code == 200
+        assert 'filename="ep_selected_files.zip"' in response.headers["content-disposition"]
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+            assert zf.read("ep_transcript.txt") == b"Test transcript"
+            assert zf.read("ep_subtitles.srt") == b"Test subtitles"
+
+    def test_download_zip_rejects_unregistered_dir(self, client, output_dir, outside_file):
+        response = client.get("/download-zip", params={"path": [str(outside_file)]})
+        assert response.status_code == 404
+
+    def test_download_zip_rejects_dotdot_traversal(self, client, output_dir, outside_file):
+        traversal = os.path.join(str(output_dir), "..", "outside", "secret.txt")
+        response = client.get("/download-zip", params={
+            "path": [str(output_dir / "ep_transcript.txt"), traversal]
+        })
+        assert response.status_code == 404
+
+    def test_download_zip_rejects_symlink_escape(self, client, output_dir, outside_file):
+        link = output_dir / "link.txt"
+        link.symlink_to(outside_file)
+        response = client.get("/download-zip", params={"path": [str(link)]})
+        assert response.status_code == 404
+
+    def test_mounted_interface_shows_errors(self):
+        import gradio as gr
+        with gr.Blocks() as interface:
+            gr.Markdown("test")
+        interface.show_error = False
+
+        app.create_app(interface)
+        assert interface.show_error is True
+
+    def test_old_output_dirs_are_released(self, output_dir, tmp_path, monkeypatch):
+        import services.file_service as file_service
+        monkeypatch.setattr(file_service, "MAX_SERVED_OUTPUT_DIRS", 1)
+        newer = tmp_path / "newer_job"
+        newer.mkdir()
+
+        file_service.register_output_dir(str(newer))
+
+        # Only the registration is dropped; a download in progress keeps its files
+        assert (output_dir / "ep_transcript.txt").exists()
+        assert not file_service.is_servable_path(str(output_dir / "ep_transcript.txt"))
+        assert list(file_service._OUTPUT_DIRS) == [os.path.realpath(str(newer))]
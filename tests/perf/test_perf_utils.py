@@ -0,0 +1,79 @@
+"""
+Benchmarks for the timestamp, URL and transcript analysis hot paths
+
+Run with: pytest tests/perf/ --codspeed
+Inputs are built outside the benchmarked call so only the target function is timed.
+"""
+import os
+import sys
+import pytest
+import numpy as np
+
+pytest.importorskip("pytest_codspeed")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from utils.file_utils import detect_file_source, convert_dropbox_to_direct
+from utils.format_utils import format_srt_time, format_srt_time_ms, _format_hms
+from processors.transcript_processor import analyze_transcript_quality
+
+
+@pytest.fixture(scope="module")
+def timestamps():
+    """One hour of timestamps at roughly word density"""
+    return np.linspace(0, 3600, 10_000).tolist()
+
+
+@pytest.fixture(scope="module")
+def urls():
+    """A mix of every supported source plus unknown links"""
+    bases = [
+        "https://drive.google.com/file/d/{}/view",
+        "https://www.dropbox.com/s/{}/episode.mp3?dl=0",
+        "https://www.dropbox.com/transfer/{}",
+        "https://we.tl/t-{}",
+        "https://example.com/audio/{}.wav",
+    ]
+    return [base.format(i) for i in range(2_000) for base in bases]
+
+
+@pytest.fixture(scope="module")
+def words_data():
+    """A transcript-sized word list alternating between two speakers"""
+    starts = np.linspace(0, 3600, 10_000)
+    return [
+        {"text": f"word{i}", "start": start, "end": start + 0.3,
+         "speaker_id": f"speaker_{(i // 50) % 2}", "type": "word"}
+        for i, start in enumerate(starts.tolist())
+    ]
+
+
+@pytest.mark.benchmark
+def test_bench_format_srt_time(benchmark, timestamps):
+    def run():
+        # Measure formatting itself rather than cache hits
+        format_srt_time_ms.cache_clear()
+        _format_hms.cache_clear()
+        return [format_srt_time(t) for t in timestamps]
+    benchmark(run)
+
+
+@pytest.mark.benchmark
+def test_bench_detect_file_source(benchmark, urls):
+    def run():
+        # Measure classification itself rather than cache hits
+        detect_file_source.cache_clear()
+        return [detect_file_source(url) for url in urls]
+    benchmark(run)
+
+
+@pytest.mark.benchmark
+def test_bench_convert_dropbox_to_direct(benchmark, urls):
+    def run():
+        convert_dropbox_to_direct.cache_clear()
+        return [convert_dropbox_to_direct(url) for url in urls]
+    benchmark(run)
+
+
+@pytest.mark.benchmark
+def test_bench_analyze_transcript_quality(benchmark, words_data):
+    benchmark(analyze_transcript_quality, words_data, 3600.3)
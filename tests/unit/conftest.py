@@ -0,0 +1,30 @@
+"""
+Unit test fixtures
+"""
+import os
+import sys
+import subprocess
+import pytest
+
+_REAL_SUBPROCESS_RUN = subprocess.run
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Import app once per test session; it pulls in gradio, so collection stays cheap"""
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+    import app as app_module
+    return app_module
+
+
+@pytest.fixture(autouse=True)
+def block_subprocess(monkeypatch, request):
+    """Make an unmocked subprocess.run fail instead of spawning ffmpeg/ffprobe"""
+    # Leave tests alone that opt in or already run under a mock
+    if 'allow_subprocess' in request.keywords or subprocess.run is not _REAL_SUBPROCESS_RUN:
+        return
+
+    def blocked_run(*args, **kwargs):
+        raise RuntimeError("subprocess.run is blocked in unit tests; mock it or mark the test allow_subprocess")
+
+    monkeypatch.setattr(subprocess, 'run', blocked_run)
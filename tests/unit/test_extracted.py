@@ -0,0 +1,56 @@
+"""
+Tests for the functions extracted into scripts/validate_functions.py
+Each case is collected as its own test so pytest-xdist can spread them across workers
+"""
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
+from validate_functions import (
+    SOURCE_CASES, DROPBOX_CASES, TXT_TIMESTAMP_CASES, SRT_TIMESTAMP_CASES,
+    detect_file_source, convert_dropbox_to_direct, get_word_attr, format_txt_timestamp, format_srt_time
+)
+
+
+class MockWord:
+    def __init__(self):
+        self.text = "world"
+        self.start = 2.0
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("url,expected", SOURCE_CASES)
+def test_detect_source(url, expected):
+    assert detect_file_source(url) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("url,expected", DROPBOX_CASES)
+def test_dropbox_convert(url, expected):
+    assert convert_dropbox_to_direct(url) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("word_item,attr_name,default,expected", [
+    ({"text": "hello", "start": 1.0, "speaker_id": "speaker_1"}, "text", None, "hello"),
+    ({"text": "hello", "start": 1.0, "speaker_id": "speaker_1"}, "start", None, 1.0),
+    ({"text": "hello", "start": 1.0, "speaker_id": "speaker_1"}, "missing", "default", "default"),
+    (MockWord(), "text", None, "world"),
+    (MockWord(), "start", None, 2.0),
+    (MockWord(), "missing", "default", "default"),
+], ids=["dict-text", "dict-start", "dict-missing", "object-text", "object-start", "object-missing"])
+def test_get_word_attr(word_item, attr_name, default, expected):
+    assert get_word_attr(word_item, attr_name, default) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seconds,expected", TXT_TIMESTAMP_CASES)
+def test_format_txt(seconds, expected):
+    assert format_txt_timestamp(seconds) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seconds,expected", SRT_TIMESTAMP_CASES)
+def test_format_srt(seconds, expected):
+    assert format_srt_time(seconds) == expected
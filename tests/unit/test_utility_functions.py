@@ -3,13 +3,17 @@ Unit tests for utility functions in app.py
 These tests focus on individual functions in isolation
 """
 import pytest
+import numpy as np
 import os
 import sys
+import json
 from unittest.mock import Mock, patch
 
-# Add the project root to Python path to import app
+# Add the project root to Python path to import the app modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
-import app
+
+# These tests build TranscriptionService objects, so keep the cache and client pool per test
+pytestmark = pytest.mark.usefixtures("isolated_transcription_cache", "isolated_elevenlabs_clients")
 
 
 @pytest.mark.unit
@@ -21,7 +25,7 @@ class TestFileSourceDetection:
         ("https://docs.google.com/document/d/456/edit", "drive"),
         ("https://DRIVE.GOOGLE.com/file/d/789/view", "drive"),  # Case insensitive
     ])
-    def test_detect_google_drive_sources(self, url, expected):
+    def test_detect_google_drive_sources(self, app, url, expected):
         assert app.detect_file_source(url) == expected
 
     @pytest.mark.parametrize("url,expected", [
@@ -29,7 +33,7 @@ class TestFileSourceDetection:
         ("https://www.dropbox.com/sh/xyz/folder", "dropbox"),
         ("https://DROPBOX.com/s/test/file.wav", "dropbox"),  # Case insensitive
     ])
-    def test_detect_dropbox_sources(self, url, expected):
+    def test_detect_dropbox_sources(self, app, url, expected):
         assert app.detect_file_source(url) == expected
 
     @pytest.mark.parametrize("url,expected", [
@@ -37,7 +41,7 @@ class TestFileSourceDetection:
         ("https://dropbox.com/t/xyz789", "dropbox_transfer"),
         ("https://DROPBOX.com/TRANSFER/test", "dropbox_transfer"),  # Case insensitive
     ])
-    def test_detect_dropbox_transfer_sources(self, url, expected):
+    def test_detect_dropbox_transfer_sources(self, app, url, expected):
         assert app.detect_file_source(url) == expected
 
     @pytest.mark.parametrize("url,expected", [
@@ -45,7 +49,7 @@ class TestFileSourceDetection:
         ("https://wetransfer.com/downloads/xyz789", "wetransfer"),
         ("https://WE.TL/t-test", "wetransfer"),  # Case insensitive
     ])
-    def test_detect_wetransfer_sources(self, url, expected):
+    def test_detect_wetransfer_sources(self, app, url, expected):
         assert app.detect_file_source(url) == expected
 
     @pytest.mark.parametrize("url,expected", [
@@ -53,40 +57,66 @@ class TestFileSourceDetection:
         ("https://youtube.com/watch?v=123", "unknown"),
         ("ftp://server.com/file.wav", "unknown"),
         ("", "unknown"),
+        ("we.t", "unknown"),  # Shorter than any source keyword
+        ("we.tl", "wetransfer"),  # Shortest recognizable input
     ])
-    def test_detect_unknown_sources(self, url, expected):
+    def test_detect_unknown_sources(self, app, url, expected):
         assert app.detect_file_source(url) == expected
 
+    def test_detect_returns_source_constants(self):
+        from utils import file_utils
+        assert file_utils.detect_file_source("https://drive.google.com/file/d/1") is file_utils.SOURCE_DRIVE
+        assert file_utils.detect_file_source("https://dropbox.com/t/abc") is file_utils.SOURCE_DROPBOX_TRANSFER
+        assert file_utils.detect_file_source("https://example.com/a.mp3") is file_utils.SOURCE_UNKNOWN
+
 
 @pytest.mark.unit
 class TestDropboxUrlConversion:
     """Unit tests for Dropbox URL conversion"""
 
-    def test_convert_dl_0_to_dl_1(self):
+    def test_convert_dl_0_to_dl_1(self, app):
         input_url = "https://dropbox.com/s/abc123/file.mp3?dl=0"
         expected = "https://dropbox.com/s/abc123/file.mp3?dl=1"
         assert app.convert_dropbox_to_direct(input_url) == expected
 
-    def test_convert_dl_0_with_other_params(self):
+    def test_convert_dl_0_with_other_params(self, app):
         input_url = "https://dropbox.com/s/abc123/file.mp3?param=value&dl=0&other=test"
         expected = "https://dropbox.com/s/abc123/file.mp3?param=value&dl=1&other=test"
         assert app.convert_dropbox_to_direct(input_url) == expected
 
-    def test_add_dl_1_no_existing_params(self):
+    def test_add_dl_1_no_existing_params(self, app):
         input_url = "https://dropbox.com/s/abc123/file.mp3"
         expected = "https://dropbox.com/s/abc123/file.mp3?dl=1"
         assert app.convert_dropbox_to_direct(input_url) == expected
 
-    def test_add_dl_1_with_existing_params(self):
+    def test_add_dl_1_with_existing_params(self, app):
         input_url = "https://dropbox.com/s/abc123/file.mp3?param=value"
         expected = "https://dropbox.com/s/abc123/file.mp3?param=value&dl=1"
         assert app.convert_dropbox_to_direct(input_url) == expected
 
-    def test_preserve_existing_dl_1(self):
+    def test_preserve_existing_dl_1(self, app):
         input_url = "https://dropbox.com/s/abc123/file.mp3?dl=1"
         assert app.convert_dropbox_to_direct(input_url) == input_url
 
-    def test_non_dropbox_url_unchanged(self):
+    @pytest.mark.parametrize("input_url,expected", [
+        ("https://dropbox.com/s/abc123/file.mp3?rdl=0", "https://dropbox.com/s/abc123/file.mp3?rdl=0&dl=1"),
+        ("https://dropbox.com/s/abc123/file.mp3?dl=0abc", "https://dropbox.com/s/abc123/file.mp3?dl=0abc&dl=1"),
+        ("https://dropbox.com/s/abc123/file.mp3?dl=0#top", "https://dropbox.com/s/abc123/file.mp3?dl=1#top"),
+        ("https://dropbox.com/s/abc123/file.mp3?x=1&dl=0&y=2", "https://dropbox.com/s/abc123/file.mp3?x=1&dl=1&y=2"),
+    ])
+    def test_dl_matched_as_whole_parameter(self, input_url, expected):
+        from utils.file_utils import convert_dropbox_to_direct
+        assert convert_dropbox_to_direct(input_url) == expected
+
+    @pytest.mark.parametrize("input_url,expected", [
+        ("https://www.dropbox.com/s/a#dl=1", "https://www.dropbox.com/s/a?dl=1#dl=1"),
+        ("https://www.dropbox.com/s/a?x=1#dl=0", "https://www.dropbox.com/s/a?x=1&dl=1#dl=0"),
+    ])
+    def test_dl_in_fragment_is_ignored(self, input_url, expected):
+        from utils.file_utils import convert_dropbox_to_direct
+        assert convert_dropbox_to_direct(input_url) == expected
+
+    def test_non_dropbox_url_unchanged(self, app):
         urls = [
             "https://example.com/file.mp3",
             "https://drive.google.com/file/123",
@@ -100,18 +130,18 @@ class TestDropboxUrlConversion:
 class TestWordAttributeGetter:
     """Unit tests for get_word_attr function"""
 
-    def test_get_word_attr_dict_existing_key(self):
+    def test_get_word_attr_dict_existing_key(self, app):
         word_dict = {"text": "hello", "start": 1.5, "end": 2.0, "speaker_id": "speaker_1"}
         assert app.get_word_attr(word_dict, "text") == "hello"
         assert app.get_word_attr(word_dict, "start") == 1.5
         assert app.get_word_attr(word_dict, "speaker_id") == "speaker_1"
 
-    def test_get_word_attr_dict_missing_key(self):
+    def test_get_word_attr_dict_missing_key(self, app):
         word_dict = {"text": "hello"}
         assert app.get_word_attr(word_dict, "missing_key") is None
         assert app.get_word_attr(word_dict, "missing_key", "default") == "default"
 
-    def test_get_word_attr_object_existing_attr(self):
+    def test_get_word_attr_object_existing_attr(self, app):
         word_obj = Mock()
         word_obj.text = "hello"
         word_obj.start = 1.5
@@ -121,7 +151,7 @@ class TestWordAttributeGetter:
         assert app.get_word_attr(word_obj, "start") == 1.5
         assert app.get_word_attr(word_obj, "speaker_id") == "speaker_1"
 
-    def test_get_word_attr_object_missing_attr(self):
+    def test_get_word_attr_object_missing_attr(self, app):
         word_obj = Mock()
         word_obj.text = "hello"
 
@@ -129,7 +159,17 @@ class TestWordAttributeGetter:
         assert app.get_word_attr(word_obj, "missing_attr") is None
         assert app.get_word_attr(word_obj, "missing_attr", "default") == "default"
 
-    def test_get_word_attr_invalid_input(self):
+    def test_word_attr_values_mixed_words(self):
+        from types import SimpleNamespace
+        from utils.file_utils import get_word_attr, word_attr_values
+        words = [{"text": "hello", "speaker_id": "speaker_1"}, SimpleNamespace(text="world"), None]
+
+        assert word_attr_values(words, "speaker_id", "speaker_unknown") == [
+            get_word_attr(word, "speaker_id", "speaker_unknown") for word in words
+        ]
+        assert word_attr_values(words, "text") == ["hello", "world", None]
+
+    def test_get_word_attr_invalid_input(self, app):
         # Test with None
         assert app.get_word_attr(None, "text") is None
         assert app.get_word_attr(None, "text", "default") == "default"
@@ -139,6 +179,59 @@ class TestWordAttributeGetter:
         assert app.get_word_attr("invalid", "text", "default") == "default"
 
 
+@pytest.mark.unit
+class TestJsonLoading:
+    """Unit tests for transcript JSON loading"""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_load_json_file(self, app, use_orjson, tmp_path, sample_elevenlabs_response):
+        import json
+        import utils.file_utils as file_utils
+        json_file = tmp_path / "transcript.json"
+        json_file.write_text(json.dumps(sample_elevenlabs_response), encoding='utf-8')
+
+        with patch.object(file_utils, 'orjson', file_utils.orjson if use_orjson else None):
+            assert app.load_json_file(str(json_file)) == sample_elevenlabs_response
+
+
+@pytest.mark.unit
+class TestFileExtensions:
+    """Unit tests for file extension helpers"""
+
+    @pytest.mark.parametrize("filename,expected", [
+        ("episode.MP3", ".mp3"),
+        ("file.tar.gz", ".gz"),
+        ("/tmp/upload.dir/episode", ""),
+        ("/tmp/upload/episode.wav", ".wav"),
+        (".hiddenfile", ""),
+        ("..double", ""),
+        ("trailing.", "."),
+        ("noextension", ""),
+    ])
+    def test_get_file_extension_matches_splitext(self, filename, expected):
+        from utils.file_utils import get_file_extension
+        assert get_file_extension(filename) == expected
+        assert expected == os.path.splitext(filename)[1].lower()
+
+    def test_is_supported_file(self):
+        from utils.file_utils import is_supported_file
+        assert is_supported_file("episode.MP3")
+        assert is_supported_file("transcript.json")
+        assert not is_supported_file("notes.txt")
+        assert is_supported_file("notes.txt", [".txt"])
+
+    def test_generate_output_filenames(self):
+        from utils.file_utils import generate_output_filenames
+        filenames = generate_output_filenames("ep01")
+        assert filenames == {
+            'txt': "ep01_transcript.txt",
+            'srt': "ep01_subtitles.srt",
+            'json': "ep01_raw_transcript.json"
+        }
+        with pytest.raises(TypeError):
+            filenames['txt'] = "changed.txt"
+
+
 @pytest.mark.unit
 class TestTimestampFormatting:
     """Unit tests for timestamp formatting functions"""
@@ -153,10 +246,10 @@ class TestTimestampFormatting:
         (7323, "02:02:03"),
         (None, "00:00:00"),
     ])
-    def test_format_txt_timestamp(self, seconds, expected):
+    def test_format_txt_timestamp(self, app, seconds, expected):
         assert app.format_txt_timestamp(seconds) == expected
 
-    def test_format_txt_timestamp_float_input(self):
+    def test_format_txt_timestamp_float_input(self, app):
         # Should handle float input by converting to int
         assert app.format_txt_timestamp(65.7) == "00:01:05"
         assert app.format_txt_timestamp(3661.9) == "01:01:01"
@@ -170,28 +263,55 @@ class TestTimestampFormatting:
         (3661.567, "01:01:01,567"),
         (None, "00:00:00,000"),
     ])
-    def test_format_srt_time(self, seconds, expected):
+    def test_format_srt_time(self, app, seconds, expected):
         assert app.format_srt_time(seconds) == expected
 
-    def test_format_srt_time_rounding(self):
+    def test_format_srt_time_rounding(self, app):
         # Test millisecond rounding
         assert app.format_srt_time(1.0004) == "00:00:01,000"  # Rounds down
         assert app.format_srt_time(1.0005) == "00:00:01,001"  # Rounds up
 
+    @pytest.mark.parametrize("millis,expected", [
+        (0, "00:00:00,000"),
+        (100, "00:00:00,100"),
+        (65500, "00:01:05,500"),
+        (3661567, "01:01:01,567"),
+    ])
+    def test_format_srt_time_ms(self, millis, expected):
+        from utils.format_utils import format_srt_time_ms
+        assert format_srt_time_ms(millis) == expected
+
+    def test_format_txt_timestamps_matches_scalar(self):
+        from utils.format_utils import format_txt_timestamp, format_txt_timestamps
+        values = [0, 30, 65.7, 3600, 3661.9, 7323, None]
+        assert format_txt_timestamps(values) == [format_txt_timestamp(v) for v in values]
+
+    def test_format_srt_times_matches_scalar(self):
+        from utils.format_utils import format_srt_time, format_srt_times
+        values = [0, 30.5, 60.123, 90.999, 3600.001, 3661.567, 1.0004, 1.0005]
+        assert format_srt_times(values) == [format_srt_time(v) for v in values]
+        assert format_srt_times([]) == []
+
+    def test_timestamps_past_99_hours(self):
+        from utils.format_utils import format_srt_time, format_srt_times, format_txt_timestamps
+        assert format_srt_time(360000.5) == "100:00:00,500"
+        assert format_srt_times([1.5, 360000.5]) == ["00:00:01,500", "100:00:00,500"]
+        assert format_txt_timestamps([1.5, 360000.5]) == ["00:00:01", "100:00:00"]
+
 
 @pytest.mark.unit
 class TestTranscriptQualityAnalysis:
     """Unit tests for transcript quality analysis"""
 
-    def test_analyze_empty_words_data(self):
+    def test_analyze_empty_words_data(self, app):
         warnings = app.analyze_transcript_quality([])
         assert warnings == []
 
-    def test_analyze_none_words_data(self):
+    def test_analyze_none_words_data(self, app):
         warnings = app.analyze_transcript_quality(None)
         assert warnings == []
 
-    def test_analyze_normal_transcript(self):
+    def test_analyze_normal_transcript(self, app):
         words_data = [
             {"text": "Hello", "start": 0.0, "end": 0.5},
             {"text": "world", "start": 0.6, "end": 1.0},
@@ -201,7 +321,7 @@ class TestTranscriptQualityAnalysis:
         # Normal data should produce minimal warnings
         assert len(warnings) <= 1
 
-    def test_analyze_transcript_with_long_final_token(self):
+    def test_analyze_transcript_with_long_final_token(self, app):
         words_data = [
             {"text": "Hello", "start": 0.0, "end": 0.5},
             {"text": "world", "start": 0.6, "end": 1.0},
@@ -213,7 +333,7 @@ class TestTranscriptQualityAnalysis:
         assert any("Final token has abnormal duration" in str(w) for w in warnings)
         assert any("very_long_final" in str(w) for w in warnings)
 
-    def test_analyze_transcript_with_outliers(self):
+    def test_analyze_transcript_with_outliers(self, app):
         # Create data with clear outliers
         normal_words = [
             {"text": f"word{i}", "start": i * 0.5, "end": i * 0.5 + 0.4}
@@ -228,7 +348,7 @@ class TestTranscriptQualityAnalysis:
         assert any("outlier" in str(w) for w in warnings)
         assert any("unusual duration" in str(w) for w in warnings)
 
-    def test_analyze_transcript_incomplete(self):
+    def test_analyze_transcript_incomplete(self, app):
         words_data = [
             {"text": "Short", "start": 0.0, "end": 0.5},
             {"text": "transcript", "start": 1.0, "end": 2.0}
@@ -240,7 +360,7 @@ class TestTranscriptQualityAnalysis:
         # Should detect incomplete transcript
         assert any("incomplete" in str(w).lower() for w in warnings)
 
-    def test_analyze_transcript_missing_timestamps(self):
+    def test_analyze_transcript_missing_timestamps(self, app):
         words_data = [
             {"text": "Hello", "start": 0.0, "end": 0.5},
             {"text": "missing", "start": None, "end": None},  # Missing timestamps
@@ -251,43 +371,401 @@ class TestTranscriptQualityAnalysis:
         # Should handle missing timestamps gracefully
         assert isinstance(warnings, list)
 
+    @pytest.mark.parametrize("data,expected", [
+        ({"text": "hello", "words": []}, True),
+        ({"text": "hello"}, True),
+        ({"words": []}, True),
+        ({"invalid": "format"}, False),
+        (["text", "words"], False),
+        ("text and words", False),
+    ])
+    def test_is_elevenlabs_transcript(self, data, expected):
+        from processors.transcript_processor import is_elevenlabs_transcript
+        assert is_elevenlabs_transcript(data) is expected
+
+    def test_intern_speaker_ids(self):
+        from processors.transcript_processor import intern_speaker_ids
+        words_data = [
+            {"text": "Hello", "speaker_id": "".join(["speaker", "_1"])},
+            {"text": "world", "speaker_id": "".join(["speaker", "_1"])},
+            {"text": "again"}
+        ]
+        intern_speaker_ids(words_data)
+
+        assert words_data[0]["speaker_id"] is words_data[1]["speaker_id"]
+        assert "speaker_id" not in words_data[2]
+
+    def test_words_to_columns(self, app):
+        from processors.transcript_processor import words_to_columns
+        words_data = [
+            {"text": "Hello", "start": 0.0, "end": 0.5, "speaker_id": "speaker_1"},
+            {"text": "missing", "start": None, "end": None},
+            {"text": "world", "start": 1.0, "end": 1.5, "speaker_id": "speaker_1"}
+        ]
+        columns = words_to_columns(words_data)
+
+        assert columns.texts == ["Hello", "missing", "world"]
+        assert np.isnan(columns.starts[1])
+        assert columns.speaker_names == ["speaker_1", "speaker_unknown"]
+        assert columns.speakers.tolist() == [0, 1, 0]
+        assert app.analyze_transcript_quality(columns) == app.analyze_transcript_quality(words_data)
+
+
+SPEAKER_WORDS = [
+    {"text": "Hello", "start": 0.0, "end": 0.5, "speaker_id": "speaker_1"},
+    {"text": "there", "start": 0.6, "end": 1.0, "speaker_id": "speaker_1"},
+    {"text": "skipped", "start": None, "end": 1.2, "speaker_id": "speaker_1"},
+    {"text": "Hi", "start": 1.3, "end": 1.5, "speaker_id": "speaker_2"},
+    {"text": "again", "start": 1.6, "end": 2.0},
+]
+
+
+@pytest.mark.unit
+class TestSpeakerGrouping:
+    """Unit tests for speaker grouping on word lists and on WordColumns"""
+
+    @pytest.mark.parametrize("as_objects", [False, True], ids=["dicts", "objects"])
+    def test_word_list_matches_columns(self, as_objects):
+        from types import SimpleNamespace
+        from processors.transcript_processor import group_words_by_speaker, words_to_columns, count_unique_speakers
+        from processors.output_generator import generate_txt_transcript
+        words = [SimpleNamespace(**word) for word in SPEAKER_WORDS] if as_objects else SPEAKER_WORDS
+        columns = words_to_columns(words)
+
+        assert group_words_by_speaker(words) == group_words_by_speaker(columns) == [
+            {'speaker': 'speaker_1', 'start_time': 0.0, 'text_parts': ['Hello', 'there']},
+            {'speaker': 'speaker_2', 'start_time': 1.3, 'text_parts': ['Hi']},
+            {'speaker': 'speaker_unknown', 'start_time': 1.6, 'text_parts': ['again']},
+        ]
+        assert generate_txt_transcript(words) == generate_txt_transcript(columns)
+        assert count_unique_speakers(words) == count_unique_speakers(columns) == 3
+
 
 @pytest.mark.unit
 class TestAudioDurationExtraction:
     """Unit tests for audio duration extraction"""
 
-    @patch('subprocess.run')
-    def test_get_audio_duration_success(self, mock_run):
-        mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = "123.45"
+    @pytest.mark.parametrize("returncode,stdout,side_effect,expected", [
+        (0, "123.45", None, 123.45),
+        (1, "", None, None),  # Non-zero return code
+        (0, "not_a_number", None, None),  # Invalid output
+        (0, "", FileNotFoundError("ffprobe not found"), None),
+    ], ids=["success", "failure", "invalid_output", "exception"])
+    def test_get_audio_duration(self, app, mock_ffprobe, returncode, stdout, side_effect, expected):
+        mock_ffprobe.return_value.returncode = returncode
+        mock_ffprobe.return_value.stdout = stdout
+        mock_ffprobe.side_effect = side_effect
 
         duration = app.get_audio_duration("/fake/path.mp3")
-        assert duration == 123.45
+        assert duration == expected
 
         # Verify subprocess was called with correct arguments
-        mock_run.assert_called_once()
-        args = mock_run.call_args[0][0]
+        mock_ffprobe.assert_called_once()
+        args = mock_ffprobe.call_args[0][0]
         assert args[0] == 'ffprobe'
         assert '/fake/path.mp3' in args
 
     @patch('subprocess.run')
-    def test_get_audio_duration_failure(self, mock_run):
-        mock_run.return_value.returncode = 1  # Non-zero return code
+    @patch('services.audio_service.MutagenFile')
+    def test_get_audio_duration_from_header(self, mock_mutagen, mock_run, app):
+        mock_mutagen.return_value.info.length = 42.5
 
         duration = app.get_audio_duration("/fake/path.mp3")
-        assert duration is None
+        assert duration == 42.5
+
+        # Header read succeeded, so ffprobe should not be spawned
+        mock_run.assert_not_called()
 
     @patch('subprocess.run')
-    def test_get_audio_duration_exception(self, mock_run):
-        mock_run.side_effect = FileNotFoundError("ffprobe not found")
+    @patch('services.audio_service.av')
+    @patch('services.audio_service.MutagenFile', None)
+    def test_get_audio_duration_from_container(self, mock_av, mock_run, app):
+        mock_av.time_base = 1000000
+        mock_av.open.return_value.__enter__.return_value.duration = 90500000
+
+        duration = app.get_audio_duration("/fake/path.avi")
+        assert duration == 90.5
+        mock_run.assert_not_called()
+
+
+def _write_chunks(chunk_count):
+    """Build a subprocess.run side effect that writes chunk files like ffmpeg's segment muxer"""
+    def run(command, **kwargs):
+        pattern = command[-1]
+        for index in range(chunk_count):
+            with open(pattern % index, "wb") as chunk_file:
+                chunk_file.write(b"chunk")
+        return Mock(returncode=0)
+    return run
+
+
+def _chunk_response(text, words):
+    """Build a transcription response for one chunk from (text, start, end) word tuples"""
+    from elevenlabs import SpeechToTextChunkResponseModel
+    return SpeechToTextChunkResponseModel.model_validate({
+        "language_code": "en",
+        "language_probability": 1.0,
+        "text": text,
+        "words": [
+            {"text": word, "type": "word", "logprob": 0.0, "start": start, "end": end, "speaker_id": "speaker_0"}
+            for word, start, end in words
+        ]
+    })
 
-        duration = app.get_audio_duration("/fake/path.mp3")
-        assert duration is None
+
+@pytest.mark.unit
+class TestChunkedTranscription:
+    """Unit tests for splitting audio and transcribing the chunks in parallel"""
 
     @patch('subprocess.run')
-    def test_get_audio_duration_invalid_output(self, mock_run):
-        mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = "not_a_number"
+    def test_split_audio_file_orders_chunks_with_offsets(self, mock_run, tmp_path):
+        from services.audio_service import split_audio_file
+        mock_run.side_effect = _write_chunks(3)
+        # A leftover chunk from an earlier, longer run must not be picked up
+        (tmp_path / "episode_chunk_005.mp3").write_bytes(b"stale")
 
-        duration = app.get_audio_duration("/fake/path.mp3")
-        assert duration is None
\ No newline at end of file
+        chunks = split_audio_file(str(tmp_path / "episode.mp3"), str(tmp_path), "episode", chunk_seconds=600)
+
+        assert [start for _, start in chunks] == [0, 600, 1200]
+        assert [os.path.basename(path) for path, _ in chunks] == [
+            "episode_chunk_000.mp3", "episode_chunk_001.mp3", "episode_chunk_002.mp3"
+        ]
+
+    @patch('subprocess.run')
+    def test_split_audio_file_without_output_raises(self, mock_run, tmp_path):
+        from services.audio_service import split_audio_file
+        mock_run.side_effect = _write_chunks(0)
+
+        with pytest.raises(Exception, match="no audio chunks"):
+            split_audio_file(str(tmp_path / "episode.mp3"), str(tmp_path), "episode")
+
+    @patch('services.transcription_service.AsyncElevenLabs')
+    def test_transcribe_audio_chunked_merges_in_playback_order(self, mock_async_client, tmp_path):
+        import asyncio
+        from services.transcription_service import TranscriptionService
+
+        responses = {
+            "part_0.mp3": _chunk_response("Hello there.", [("Hello", 0.0, 0.5), ("there.", 0.6, 1.0)]),
+            "part_1.mp3": _chunk_response("General Kenobi.", [("General", 0.2, 0.7), ("Kenobi.", 0.8, 1.4)]),
+        }
+
+        async def convert(**kwargs):
+            file_name = kwargs["file"][0]
+            # The first chunk finishes last, so merge order cannot rely on completion order
+            await asyncio.sleep(0.05 if file_name == "part_0.mp3" else 0)
+            return responses[file_name]
+
+        mock_async_client.return_value.speech_to_text.convert.side_effect = convert
+        chunk_paths = []
+        for index, start in enumerate([0, 600]):
+            chunk_path = tmp_path / f"part_{index}.mp3"
+            chunk_path.write_bytes(b"chunk")
+            chunk_paths.append((str(chunk_path), start))
+
+        result = TranscriptionService("test_key").transcribe_audio_chunked(chunk_paths)
+
+        assert result.text == "Hello there. General Kenobi."
+        assert [word.text for word in result.words] == ["Hello", "there.", "General", "Kenobi."]
+        assert [(word.start, word.end) for word in result.words] == [
+            (0.0, 0.5), (0.6, 1.0), (600.2, 600.7), (600.8, 601.4)
+        ]
+
+    def test_transcribe_audio_chunked_without_chunks_raises(self):
+        from services.transcription_service import TranscriptionService
+
+        with pytest.raises(ValueError, match="No audio chunks"):
+            TranscriptionService("test_key").transcribe_audio_chunked([])
+
+
+@pytest.mark.unit
+class TestTranscriptionCache:
+    """Unit tests for the on-disk transcription cache"""
+
+    @pytest.fixture
+    def audio_file(self, tmp_path):
+        audio_file = tmp_path / "episode.mp3"
+        audio_file.write_bytes(b"audio")
+        return str(audio_file)
+
+    @pytest.fixture
+    def mock_convert(self):
+        with patch('services.transcription_service.ElevenLabs') as mock_client:
+            convert = mock_client.return_value.speech_to_text.convert
+            convert.return_value = _chunk_response("Hello there.", [("Hello", 0.0, 0.5), ("there.", 0.6, 1.0)])
+            yield convert
+
+    def test_miss_calls_api_and_writes_cache(self, audio_file, mock_convert):
+        from services.transcription_service import TranscriptionService, get_cache_path
+
+        result = TranscriptionService("test_key").transcribe_audio(audio_file)
+
+        assert result.text == "Hello there."
+        mock_convert.assert_called_once()
+        cache_path = get_cache_path(audio_file, "en", True)
+        assert os.path.exists(cache_path)
+        assert os.listdir(os.path.dirname(cache_path)) == [os.path.basename(cache_path)]
+
+    def test_hit_skips_api(self, audio_file, mock_convert):
+        from services.transcription_service import TranscriptionService
+
+        TranscriptionService("test_key").transcribe_audio(audio_file)
+        result = TranscriptionService("test_key").transcribe_audio(audio_file)
+
+        assert result.text == "Hello there."
+        assert [word.text for word in result.words] == ["Hello", "there."]
+        mock_convert.assert_called_once()
+
+    def test_extracted_json_keeps_null_fields(self):
+        from elevenlabs import SpeechToTextChunkResponseModel
+        from services.transcription_service import TranscriptionService
+        response = SpeechToTextChunkResponseModel.model_validate({
+            "language_code": "en",
+            "language_probability": 1.0,
+            "text": "Hello",
+            "words": [{"text": "Hello", "type": "word", "logprob": 0.0, "start": 0.0, "end": 0.5}]
+        })
+
+        _, _, response_dict = TranscriptionService("test_key").extract_transcription_data(response)
+
+        # The raw JSON users download keeps every field, including nulls
+        assert response_dict["words"][0]["speaker_id"] is None
+        assert response_dict == response.model_dump(mode="json")
+
+    @pytest.mark.parametrize("content", ["{not json", '{"text": "missing fields"}'], ids=["invalid_json", "invalid_model"])
+    def test_corrupt_entry_is_replaced(self, audio_file, mock_convert, content):
+        from services.transcription_service import TranscriptionService, get_cache_path
+        cache_path = get_cache_path(audio_file, "en", True)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+        result = TranscriptionService("test_key").transcribe_audio(audio_file)
+
+        assert result.text == "Hello there."
+        mock_convert.assert_called_once()
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            assert json.load(f)["text"] == "Hello there."
+
+
+def _streamed_response(chunks, content_length):
+    """Build a mocked streaming response that advertises content_length bytes"""
+    response = Mock()
+    response.headers = {'content-length': str(content_length)}
+    response.iter_content.return_value = iter(chunks)
+    return response
+
+
+@pytest.mark.unit
+class TestDownloadStreaming:
+    """Unit tests for writing downloads to disk"""
+
+    def test_short_body_truncates_preallocation(self, tmp_path):
+        from services.download_service import write_response_to_file
+        output_path = tmp_path / "episode.mp3"
+
+        write_response_to_file(_streamed_response([b"a" * 8192, b"b" * 100], 1_000_000), str(output_path))
+
+        assert output_path.stat().st_size == 8292
+        assert output_path.read_bytes() == b"a" * 8192 + b"b" * 100
+
+    def test_without_posix_fallocate(self, tmp_path, monkeypatch):
+        from services.download_service import write_response_to_file
+        monkeypatch.delattr(os, 'posix_fallocate', raising=False)
+        output_path = tmp_path / "episode.mp3"
+
+        write_response_to_file(_streamed_response([b"audio"], 5000), str(output_path))
+
+        assert output_path.read_bytes() == b"audio"
+
+    def test_posix_fallocate_error_is_ignored(self, tmp_path, monkeypatch):
+        from services.download_service import write_response_to_file
+        fallocate = Mock(side_effect=OSError(95, "Operation not supported"))
+        monkeypatch.setattr(os, 'posix_fallocate', fallocate, raising=False)
+        output_path = tmp_path / "episode.mp3"
+
+        write_response_to_file(_streamed_response([b"audio"], 5000), str(output_path))
+
+        fallocate.assert_called_once()
+        assert output_path.read_bytes() == b"audio"
+
+
+DRIVE_CONFIRM_PAGE = """
+<html><body>
+<form id="download-form" action="https://drive.usercontent.google.com/download" method="get">
+  <input type="hidden" name="id" value="abc123">
+  <input type="hidden" name="export" value="download">
+  <input type="hidden" name="confirm" value="t">
+  <input type="hidden" name="uuid" value="0f1e2d3c">
+</form>
+</body></html>
+"""
+
+
+@pytest.mark.unit
+class TestGoogleDriveDownload:
+    """Unit tests for Google Drive downloads against mocked HTTP responses"""
+
+    @pytest.mark.parametrize("url", [
+        "https://drive.google.com/file/d/abc123/view?usp=sharing",
+        "https://drive.google.com/file/d/abc123/view",
+        "https://drive.google.com/open?id=abc123",
+        "https://drive.google.com/uc?export=download&id=abc123",
+        "https://docs.google.com/document/d/abc123/edit",
+    ], ids=["file-view-shared", "file-view", "open-id", "uc-id", "docs"])
+    def test_extract_file_id(self, url):
+        from services.download_service import extract_google_drive_file_id
+        assert extract_google_drive_file_id(url) == "abc123"
+
+    def test_extract_file_id_missing(self):
+        from services.download_service import extract_google_drive_file_id
+        with pytest.raises(ValueError):
+            extract_google_drive_file_id("https://drive.google.com/drive/my-drive")
+
+    def test_direct_download(self, requests_mock, tmp_path):
+        from services.download_service import download_from_google_drive, GOOGLE_DRIVE_DOWNLOAD_URL
+        requests_mock.get(GOOGLE_DRIVE_DOWNLOAD_URL, content=b"audio bytes",
+                          headers={'content-type': 'audio/mpeg', 'content-length': '11'})
+        output_path = tmp_path / "episode.mp3"
+
+        download_from_google_drive("https://drive.google.com/file/d/abc123/view", str(output_path))
+
+        assert output_path.read_bytes() == b"audio bytes"
+        assert requests_mock.call_count == 1
+        assert requests_mock.last_request.qs == {'export': ['download'], 'id': ['abc123']}
+
+    def test_confirm_form_download(self, requests_mock, tmp_path):
+        from services.download_service import download_from_google_drive, GOOGLE_DRIVE_DOWNLOAD_URL
+        requests_mock.get(GOOGLE_DRIVE_DOWNLOAD_URL, text=DRIVE_CONFIRM_PAGE,
+                          headers={'content-type': 'text/html; charset=utf-8'})
+        requests_mock.get("https://drive.usercontent.google.com/download", content=b"large audio",
+                          headers={'content-type': 'application/octet-stream'})
+        output_path = tmp_path / "episode.mp3"
+
+        download_from_google_drive("https://drive.google.com/file/d/abc123/view", str(output_path))
+
+        assert output_path.read_bytes() == b"large audio"
+        assert requests_mock.call_count == 2
+        assert requests_mock.last_request.qs == {
+            'id': ['abc123'], 'export': ['download'], 'confirm': ['t'], 'uuid': ['0f1e2d3c']
+        }
+
+    def test_html_error_page_is_not_saved(self, requests_mock, tmp_path):
+        from services.download_service import download_from_google_drive, GOOGLE_DRIVE_DOWNLOAD_URL
+        requests_mock.get(GOOGLE_DRIVE_DOWNLOAD_URL, text="<html><body>Access denied</body></html>",
+                          headers={'content-type': 'text/html'})
+        output_path = tmp_path / "episode.mp3"
+
+        with pytest.raises(ValueError, match="not publicly accessible"):
+            download_from_google_drive("https://drive.google.com/file/d/abc123/view", str(output_path))
+        assert not output_path.exists()
+
+    def test_html_after_confirm_is_not_saved(self, requests_mock, tmp_path):
+        from services.download_service import download_from_google_drive, GOOGLE_DRIVE_DOWNLOAD_URL
+        requests_mock.get(GOOGLE_DRIVE_DOWNLOAD_URL, text=DRIVE_CONFIRM_PAGE, headers={'content-type': 'text/html'})
+        requests_mock.get("https://drive.usercontent.google.com/download", text="<html>Quota exceeded</html>",
+                          headers={'content-type': 'text/html'})
+        output_path = tmp_path / "episode.mp3"
+
+        with pytest.raises(ValueError, match="error page"):
+            download_from_google_drive("https://drive.google.com/file/d/abc123/view", str(output_path))
+        assert not output_path.exists()
@@ -1,12 +1,14 @@
 """
 Gradio interface for Valuebell Transcriber
 """
-import gradio as gr
 from config.settings import SUPPORTED_LANGUAGES, ALL_SUPPORTED_EXTENSIONS
 
 
 def create_interface(process_function, download_function, clear_function):
     """Create the Gradio interface"""
+    # Imported here so importing this module (e.g. from tests) does not load gradio
+    import gradio as gr
+
     with gr.Blocks(title="Valuebell Transcriber", theme=gr.themes.Soft()) as interface:
         gr.Markdown("# 🔔 Valuebell Transcriber")
         gr.Markdown("*Upload your audio or video files to get accurate transcripts with automatic speaker detection. Perfect for podcasts, interviews, and meetings.*")
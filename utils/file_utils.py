@@ -3,58 +3,130 @@ File handling utilities for Valuebell Transcriber
 """
 import os
 import re
+import sys
+import json
+from functools import lru_cache
+from types import MappingProxyType
+from config.settings import ALL_SUPPORTED_EXTENSION_SET
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib parser is used without it
+    orjson = None
+
+
+class _FilenameTable(dict):
+    """str.translate table keeping alphanumerics, '_' and '-' and mapping everything else to '_'"""
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        value = char if char.isalnum() or char in ('_', '-') else '_'
+        self[codepoint] = value
+        return value
+
+
+# ASCII is filled up front; other code points are added the first time they are seen
+_FILENAME_TABLE = _FilenameTable()
+for _codepoint in range(128):
+    _FILENAME_TABLE.__missing__(_codepoint)
+del _codepoint
 
 
 def clean_filename(name):
     """Clean filename by removing invalid characters"""
-    return "".join(c if c.isalnum() or c in ('_', '-') else '_' for c in name.strip())
+    return name.strip().translate(_FILENAME_TABLE)
 
 
+# Source types returned by detect_file_source. They are interned, so the
+# == checks that dispatch on them succeed on identity without comparing text.
+SOURCE_DRIVE = sys.intern('drive')
+SOURCE_DROPBOX = sys.intern('dropbox')
+SOURCE_DROPBOX_TRANSFER = sys.intern('dropbox_transfer')
+SOURCE_WETRANSFER = sys.intern('wetransfer')
+SOURCE_UNKNOWN = sys.intern('unknown')
+
+# Shortest strings that can match a source keyword / a Dropbox host
+_MIN_SOURCE_URL_LENGTH = len('we.tl')
+_MIN_DROPBOX_URL_LENGTH = len('dropbox.com')
+
+# Both URL helpers are pure, so their results are memoized. The cache is
+# bounded so a long-running server seeing many distinct URLs does not grow.
+_URL_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=_URL_CACHE_SIZE)
 def detect_file_source(url):
     """Detect if the URL is from Google Drive, Dropbox, WeTransfer, or unknown"""
+    if not url or len(url) < _MIN_SOURCE_URL_LENGTH:
+        return SOURCE_UNKNOWN
+    # One lowercase copy and plain substring checks; each 'in' is a C-level
+    # search, which beats a regex with per-branch lookaheads over the URL
     url_lower = url.lower()
     if 'drive.google' in url_lower or 'docs.google' in url_lower:
-        return 'drive'
+        return SOURCE_DRIVE
     elif 'dropbox' in url_lower:
         if '/transfer/' in url_lower or 'dropbox.com/t/' in url_lower:
-            return 'dropbox_transfer'
+            return SOURCE_DROPBOX_TRANSFER
         else:
-            return 'dropbox'
+            return SOURCE_DROPBOX
     elif 'we.tl' in url_lower or 'wetransfer.com' in url_lower:
-        return 'wetransfer'
+        return SOURCE_WETRANSFER
     else:
-        return 'unknown'
+        return SOURCE_UNKNOWN
 
 
+@lru_cache(maxsize=_URL_CACHE_SIZE)
 def convert_dropbox_to_direct(url):
     """Convert Dropbox share link to direct download link"""
-    if 'dropbox.com' in url.lower():
-        if 'dl=0' in url:
-            return url.replace('dl=0', 'dl=1')
-        elif 'dl=1' not in url:
-            separator = '&' if '?' in url else '?'
-            return f"{url}{separator}dl=1"
-    return url
+    if len(url) < _MIN_DROPBOX_URL_LENGTH:
+        return url
+    if 'dropbox.com' not in url.lower():
+        return url
+    # Set the fragment aside so dl=1 always lands in the query string
+    base, hash_mark, fragment = url.partition('#')
+    path, question_mark, query = base.partition('?')
+    if 'dl=' in query:
+        # Pad with '&' so dl=0 / dl=1 only match as whole parameters,
+        # leaving values like dl=0abc and names like rdl=0 alone
+        params = f"&{query}&"
+        if '&dl=1&' in params:
+            return url
+        if '&dl=0&' in params:
+            return f"{path}?{params.replace('&dl=0&', '&dl=1&')[1:-1]}{hash_mark}{fragment}"
+        return f"{base}&dl=1{hash_mark}{fragment}"
+    separator = '&' if question_mark else '?'
+    return f"{base}{separator}dl=1{hash_mark}{fragment}"
 
 
 def get_file_extension(filename):
     """Get file extension from filename"""
-    return os.path.splitext(filename)[1].lower()
+    # Same result as os.path.splitext: only the last path component counts
+    # and leading dots (".hiddenfile") are not an extension
+    name = filename.rpartition(os.sep)[2]
+    if os.altsep:
+        name = name.rpartition(os.altsep)[2]
+    _, dot, ext = name.lstrip('.').rpartition('.')
+    return dot + ext.lower() if dot else ''
 
 
-def is_supported_file(filename, supported_extensions):
+def is_supported_file(filename, supported_extensions=ALL_SUPPORTED_EXTENSION_SET):
     """Check if file has supported extension"""
     ext = get_file_extension(filename)
     return ext in supported_extensions
 
 
+_OUTPUT_SUFFIXES = (
+    ('txt', '_transcript.txt'),
+    ('srt', '_subtitles.srt'),
+    ('json', '_raw_transcript.json'),
+)
+
+
+@lru_cache(maxsize=256)
 def generate_output_filenames(base_name):
     """Generate output filenames for different formats"""
-    return {
-        'txt': f"{base_name}_transcript.txt",
-        'srt': f"{base_name}_subtitles.srt",
-        'json': f"{base_name}_raw_transcript.json"
-    }
+    # Cached results are shared between callers, so hand out a read-only view
+    return MappingProxyType({key: base_name + suffix for key, suffix in _OUTPUT_SUFFIXES})
 
 
 def handle_dropbox_transfer_with_prompt(url, output_dir):
@@ -87,6 +159,31 @@ def get_word_attr(word_item, attr_name, default=None):
     """Helper function to access word attributes flexibly"""
     if isinstance(word_item, dict):
         return word_item.get(attr_name, default)
-    elif hasattr(word_item, attr_name):
-        return getattr(word_item, attr_name, default)
-    return default
\ No newline at end of file
+    return getattr(word_item, attr_name, default)
+
+
+def word_attr_values(words_data, attr_name, default=None):
+    """get_word_attr for one attribute across all words, without a function call per word"""
+    return [
+        word_item.get(attr_name, default) if isinstance(word_item, dict)
+        else getattr(word_item, attr_name, default)
+        for word_item in words_data
+    ]
+
+
+def load_json_file(file_path):
+    """Load a JSON file, using orjson's faster parser when it is installed"""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_text_file(file_path):
+    """Read a UTF-8 text file, returning an empty string if it does not exist"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return ""
@@ -1,28 +1,106 @@
 """
 Formatting utilities for timestamps and text processing
 """
+from functools import lru_cache
+import numpy as np
+
+# Word timestamps repeat across cues and exports, so the scalar formatters
+# memoize on whole seconds / milliseconds rather than on raw floats
+_TIMESTAMP_CACHE_SIZE = 1 << 17
+
+# Zero-padded field strings; indexing these is much cheaper than a format
+# spec per field. Hours only use the table below 100, as "%02d" widens.
+_TWO_DIGITS = tuple("%02d" % i for i in range(100))
+_THREE_DIGITS = tuple("%03d" % i for i in range(1000))
+
+# Returned as-is for missing (None) timestamps
+_TXT_NONE = "00:00:00"
+_SRT_NONE = "00:00:00,000"
 
 
 def format_txt_timestamp(seconds_float):
     """Format timestamp for TXT files"""
     if seconds_float is None:
-        return "00:00:00"
-    seconds_int = int(seconds_float)
-    hours = seconds_int // 3600
-    minutes = (seconds_int % 3600) // 60
-    seconds = seconds_int % 60
-    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        return _TXT_NONE
+    return _format_hms(int(seconds_float))
+
+
+@lru_cache(maxsize=_TIMESTAMP_CACHE_SIZE)
+def _format_hms(total_seconds):
+    """Format whole seconds as HH:MM:SS"""
+    minutes, seconds = divmod(total_seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if 0 <= hours < 100:
+        return f"{_TWO_DIGITS[hours]}:{_TWO_DIGITS[minutes]}:{_TWO_DIGITS[seconds]}"
+    return "%02d:%02d:%02d" % (hours, minutes, seconds)
+
+
+def format_txt_timestamps(seconds_values):
+    """
+    Format many TXT timestamps at once
+
+    Truncates to whole seconds exactly like format_txt_timestamp; None/NaN
+    values become "00:00:00".
+
+    Args:
+        seconds_values: Sequence or array of timestamps in seconds
+
+    Returns:
+        list: HH:MM:SS strings in the same order
+    """
+    seconds = np.nan_to_num(np.asarray(seconds_values, dtype=np.float64)).astype(np.int64)
+    hours, seconds = np.divmod(seconds, 3600)
+    minutes, seconds = np.divmod(seconds, 60)
+    rows = zip(hours.tolist(), minutes.tolist(), seconds.tolist())
+    if not _fits_two_digits(hours):
+        return ["%02d:%02d:%02d" % values for values in rows]
+    two = _TWO_DIGITS
+    return [f"{two[h]}:{two[m]}:{two[s]}" for h, m, s in rows]
 
 
 def format_srt_time(seconds_float):
     """Format timestamp for SRT files"""
     if seconds_float is None:
-        return "00:00:00,000"
-    millis = round(seconds_float * 1000)
-    hours = millis // (3600 * 1000)
-    millis %= (3600 * 1000)
-    minutes = millis // (60 * 1000)
-    millis %= (60 * 1000)
-    seconds = millis // 1000
-    milliseconds = millis % 1000
-    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
\ No newline at end of file
+        return _SRT_NONE
+    return format_srt_time_ms(round(seconds_float * 1000))
+
+
+@lru_cache(maxsize=_TIMESTAMP_CACHE_SIZE)
+def format_srt_time_ms(millis):
+    """Format an SRT timestamp from whole milliseconds, with no float rounding step"""
+    seconds, milliseconds = divmod(millis, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if 0 <= hours < 100:
+        return (f"{_TWO_DIGITS[hours]}:{_TWO_DIGITS[minutes]}:{_TWO_DIGITS[seconds]},"
+                f"{_THREE_DIGITS[milliseconds]}")
+    return "%02d:%02d:%02d,%03d" % (hours, minutes, seconds, milliseconds)
+
+
+def format_srt_times(seconds_values):
+    """
+    Format many SRT timestamps at once
+
+    Rounds to milliseconds exactly like format_srt_time, but does the
+    arithmetic on a NumPy array so only the final string assembly is per value.
+
+    Args:
+        seconds_values: Sequence or array of timestamps in seconds (no None values)
+
+    Returns:
+        list: SRT timestamp strings in the same order
+    """
+    millis = np.rint(np.asarray(seconds_values, dtype=np.float64) * 1000).astype(np.int64)
+    hours, millis = np.divmod(millis, 3600 * 1000)
+    minutes, millis = np.divmod(millis, 60 * 1000)
+    seconds, milliseconds = np.divmod(millis, 1000)
+    rows = zip(hours.tolist(), minutes.tolist(), seconds.tolist(), milliseconds.tolist())
+    if not _fits_two_digits(hours):
+        return ["%02d:%02d:%02d,%03d" % values for values in rows]
+    two, three = _TWO_DIGITS, _THREE_DIGITS
+    return [f"{two[h]}:{two[m]}:{two[s]},{three[ms]}" for h, m, s, ms in rows]
+
+
+def _fits_two_digits(hours):
+    """Check that every hour value can be read from the _TWO_DIGITS table"""
+    return hours.size == 0 or (hours.min() >= 0 and hours.max() < 100)